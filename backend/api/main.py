@@ -6,19 +6,38 @@ allowing clients to submit campaign briefs and receive comprehensive campaign ou
 """
 
 import os
+import re
 import sys
+import json
 import asyncio
+import logging
+import time
 import traceback
+from enum import IntEnum
+from collections import Counter, defaultdict, deque
+from functools import lru_cache, partial
+from itertools import count, islice
 from datetime import datetime, timedelta
+from email.utils import formatdate
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel, Field
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
+from sse_starlette.sse import EventSourceResponse
 import uvicorn
+import aiofiles
+import orjson
 from concurrent.futures import ThreadPoolExecutor
 
+# Optional Redis mirror of campaign state so other uvicorn workers can serve finished campaigns
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
 # Add the parent directory to the path to import the src modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -28,6 +47,7 @@ from src.utils.monitoring import WorkflowMonitor, CampaignAnalytics
 from src.utils.file_handlers import create_campaign_website, save_campaign_pdf
 from src.utils.aws_config import load_aws_services
 from src.workflows.campaign_workflow import create_workflow
+from src.agents.base_agent import shutdown_event as agent_shutdown_event, set_partial_artifact_sink
 
 # Robust import for auth (supports both `python -m api.main` and `python api/main.py`)
 try:
@@ -86,11 +106,212 @@ class CampaignStatus(BaseModel):
     estimated_completion: Optional[str] = Field(None, description="Estimated completion time")
 
 
+class WorkflowStats(BaseModel):
+    """Aggregate workflow step statistics"""
+    total_steps: int = Field(..., description="Number of workflow steps")
+    completed: int = Field(..., description="Completed steps")
+    failed: int = Field(..., description="Failed steps")
+    running: int = Field(..., description="Running steps")
+    pending: int = Field(..., description="Pending steps")
+    completion_percentage: float = Field(..., description="Percentage of steps completed")
+
+
+class WorkflowProgress(BaseModel):
+    """Workflow steps response model"""
+    campaign_id: str = Field(..., description="Unique campaign identifier")
+    workflow_steps: List[Dict[str, Any]] = Field(..., description="Per-step status, interactions and artifacts")
+    workflow_stats: WorkflowStats = Field(..., description="Aggregate step statistics")
+    current_status: str = Field(..., description="Current campaign status")
+    last_update: datetime = Field(..., description="Time the response was generated")
+
+
+logger = logging.getLogger(__name__)
+
 # Global storage for campaign data and real-time updates
 campaign_results = {}
 campaign_status = {}
 campaign_progress = {}  # New: Real-time progress tracking
-agent_interactions = {}  # New: Agent interaction logs
+MAX_INTERACTIONS_PER_CAMPAIGN = 500  # Oldest interactions are evicted once a campaign's log reaches this size
+agent_interactions = defaultdict(partial(deque, maxlen=MAX_INTERACTIONS_PER_CAMPAIGN))  # New: Agent interaction logs
+interaction_counts = defaultdict(Counter)  # Running success/error tallies per campaign, kept in step with agent_interactions
+campaign_last_generated = {}  # time_ns of each campaign's most recent artifact-generation interaction
+campaign_versions = {}  # State version per campaign, bumped whenever its progress, interactions or results change
+_version_counter = count(1)
+_interaction_seq = count(1)  # Monotonic sequence stamped on every logged interaction (next() on a count is atomic)
+
+_MISSING = object()  # Sentinel for single-lookup membership checks where stored values may be falsy
+
+# Latest generated website path per campaign, rebuilt only when the outputs directory changes
+OUTPUTS_DIR = "outputs"
+_WEBSITE_FILE_RE = re.compile(r"^\d{8}_\d{6}_(.+)_campaign_website\.html$")
+_campaign_file_index = {}
+_outputs_mtime_ns = None
+
+# When nginx fronts the API (e.g. "/outputs/"), let it send website files via X-Accel-Redirect
+X_ACCEL_REDIRECT_PREFIX = os.getenv("X_ACCEL_REDIRECT_PREFIX")
+
+# How often a running campaign's record and workflow steps are re-mirrored to Redis (when they changed)
+REDIS_MIRROR_INTERVAL_SECONDS = 2
+# How long mirrored campaign keys live in Redis; every re-mirror refreshes the expiry
+REDIS_CAMPAIGN_TTL_SECONDS = int(os.getenv("REDIS_CAMPAIGN_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Browser caching for responses about completed campaigns; private because responses are per-user.
+# Failed campaigns can be retried, so they are revalidated like running ones.
+_COMPLETED_CACHE_SECONDS = 86400
+_COMPLETED_CACHE_CONTROL = f"private, max-age={_COMPLETED_CACHE_SECONDS}, immutable"
+
+
+def _campaign_cache_headers(status: Optional[str]) -> Dict[str, str]:
+    """Cache-Control (and, for HTTP/1.0 caches, Expires) for a response about a campaign in this status"""
+    if status != "completed":
+        return {"Cache-Control": "no-cache"}
+    return {
+        "Cache-Control": _COMPLETED_CACHE_CONTROL,
+        "Expires": formatdate(time.time() + _COMPLETED_CACHE_SECONDS, usegmt=True)
+    }
+
+# Integer progress percentages for the standard 17-step campaign, indexed by completed steps
+_PROGRESS_PCT_17 = tuple(min(100, int((i / 17) * 100)) for i in range(18))
+
+class StepStatus(IntEnum):
+    """Workflow step status, compared and counted as small ints and emitted by lowercase name"""
+    PENDING = 0
+    RUNNING = 1
+    COMPLETED = 2
+    FAILED = 3
+
+
+_STEP_STATUS_NAMES = tuple(step_status.name.lower() for step_status in StepStatus)
+
+# Static workflow step definitions; per-request status fields are layered on in get_workflow_steps
+_WORKFLOW_STEPS_TEMPLATE = (
+    {
+        "id": "project_manager",
+        "name": "Project Manager",
+        "description": "Initializing project and setting objectives",
+        "order": 1,
+        "category": "planning"
+    },
+    {
+        "id": "strategy",
+        "name": "Strategy Team",
+        "description": "Developing campaign strategy and positioning",
+        "order": 2,
+        "category": "planning"
+    },
+    {
+        "id": "audience_persona",
+        "name": "Audience Persona",
+        "description": "Creating detailed audience personas",
+        "order": 3,
+        "category": "research"
+    },
+    {
+        "id": "creative",
+        "name": "Creative Team",
+        "description": "Generating creative concepts and ideas",
+        "order": 4,
+        "category": "creative"
+    },
+    {
+        "id": "copy",
+        "name": "Copy Team",
+        "description": "Writing compelling copy and messaging",
+        "order": 5,
+        "category": "creative"
+    },
+    {
+        "id": "cta_optimizer",
+        "name": "CTA Optimizer",
+        "description": "Optimizing calls-to-action",
+        "order": 6,
+        "category": "optimization"
+    },
+    {
+        "id": "visual",
+        "name": "Visual Team",
+        "description": "Creating visual concepts and mood boards",
+        "order": 7,
+        "category": "design"
+    },
+    {
+        "id": "designer",
+        "name": "Designer Team",
+        "description": "Designing visual assets and layouts",
+        "order": 8,
+        "category": "design"
+    },
+    {
+        "id": "social_media_campaign",
+        "name": "Social Media",
+        "description": "Developing social media campaign",
+        "order": 9,
+        "category": "execution"
+    },
+    {
+        "id": "emotion_personalization",
+        "name": "Emotion Personalization",
+        "description": "Adding emotional intelligence",
+        "order": 10,
+        "category": "optimization"
+    },
+    {
+        "id": "media_planner",
+        "name": "Media Planner",
+        "description": "Planning media strategy and channels",
+        "order": 11,
+        "category": "planning"
+    },
+    {
+        "id": "review",
+        "name": "Review Team",
+        "description": "Quality review and validation",
+        "order": 12,
+        "category": "quality"
+    },
+    {
+        "id": "campaign_summary",
+        "name": "Campaign Summary",
+        "description": "Creating campaign summary",
+        "order": 13,
+        "category": "documentation"
+    },
+    {
+        "id": "client_summary",
+        "name": "Client Summary",
+        "description": "Generating client-facing summary",
+        "order": 14,
+        "category": "documentation"
+    },
+    {
+        "id": "web_developer",
+        "name": "Web Developer",
+        "description": "Building campaign website",
+        "order": 15,
+        "category": "execution"
+    },
+    {
+        "id": "html_validation",
+        "name": "HTML Validation",
+        "description": "Validating website code",
+        "order": 16,
+        "category": "quality"
+    }
+)
+_WORKFLOW_STEP_NAMES = frozenset(step["name"] for step in _WORKFLOW_STEPS_TEMPLATE)
+_WORKFLOW_STEP_KEYS = tuple((step["id"].lower(), step["name"].lower()) for step in _WORKFLOW_STEPS_TEMPLATE)
+
+# Progress steps that advance completed_steps (agent steps from the workflow thread, phases from the coroutine)
+_MILESTONE_STEPS_SYNC = frozenset({
+    "project_manager", "strategy", "audience_persona", "creative", "copy",
+    "cta_optimizer", "visual", "designer", "social_media_campaign",
+    "emotion_personalization", "media_planner", "review", "campaign_summary",
+    "client_summary", "web_developer", "html_validation"
+})
+_MILESTONE_STEPS_ASYNC = frozenset({
+    "analyzing_brief", "content_generation", "design_creation", "review_process", "finalizing"
+})
+
 
 
 # Initialize FastAPI app
@@ -99,7 +320,8 @@ app = FastAPI(
     description="REST API for generating comprehensive marketing campaigns using AI agents",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -112,9 +334,27 @@ app.add_middleware(
 )
 
 
+class NonStreamingGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves Server-Sent Event streams uncompressed so events flush immediately"""
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress HTML and JSON responses (websites and workflow payloads are highly compressible)
+app.add_middleware(NonStreamingGZipMiddleware, minimum_size=1024)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application on startup"""
+    # Show the agents' and AWS services' log output (uvicorn only configures its own loggers)
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
     try:
         # Load configuration
         config = load_configuration()
@@ -127,6 +367,9 @@ async def startup_event():
         app.state.workflow = workflow
         app.state.monitor = monitor
         
+        # Let long agent outputs show up on the campaign record while they are still being generated
+        set_partial_artifact_sink(_publish_partial_artifact)
+        
         # Create thread pool executor for non-blocking workflow execution
         app.state.thread_pool = ThreadPoolExecutor(max_workers=4)
         
@@ -135,6 +378,12 @@ async def startup_event():
         app.state.s3_service = s3_service
         app.state.dynamodb_service = dynamodb_service
         
+        # Connect to Redis if configured (shares campaign records across workers)
+        redis_url = os.getenv("REDIS_URL")
+        app.state.redis = aioredis.from_url(redis_url) if redis_url and aioredis else None
+        if redis_url and not aioredis:
+            print("⚠️ REDIS_URL is set but the redis package is not installed - campaign state stays in-process")
+        
         print("✅ FastAPI backend initialized successfully")
         print(f"🔧 LLM Model: {config.get('rational_model', 'Unknown')}")
         print(f"🎨 OpenAI Client: {'✅ Available' if config.get('openai_client') else '❌ Not available'}")
@@ -154,12 +403,21 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up resources on shutdown"""
+    # Wake agents sleeping between LLM retries so the pool can drain promptly
+    agent_shutdown_event.set()
     try:
         if hasattr(app.state, 'thread_pool'):
             app.state.thread_pool.shutdown(wait=True)
             print("🧵 Thread pool executor shut down successfully")
     except Exception as e:
         print(f"⚠️ Error shutting down thread pool: {e}")
+    
+    redis_client = getattr(app.state, "redis", None)
+    if redis_client is not None:
+        try:
+            await redis_client.close()
+        except Exception as e:
+            print(f"⚠️ Error closing Redis connection: {e}")
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -329,10 +587,9 @@ async def test_thread_pool():
             return {"status": "error", "message": "Thread pool not initialized"}
         
         # Test running a simple function in the thread pool
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         
         def test_function():
-            import time
             time.sleep(2)  # Simulate some work
             return "Thread pool test completed successfully"
         
@@ -505,6 +762,7 @@ async def generate_campaign_background(campaign_id: str, campaign_brief: Campaig
     This function runs the complete workflow in a separate thread to avoid blocking the main event loop.
     """
     start_time = datetime.now()
+    mirror_task = None
     
     try:
         # Initialize progress tracking
@@ -518,7 +776,9 @@ async def generate_campaign_background(campaign_id: str, campaign_brief: Campaig
         }
         
         # Initialize agent interactions log
-        agent_interactions[campaign_id] = []
+        agent_interactions[campaign_id] = deque(maxlen=MAX_INTERACTIONS_PER_CAMPAIGN)
+        interaction_counts[campaign_id] = Counter()
+        campaign_last_generated.pop(campaign_id, None)
         
         # Log initial step
         _log_agent_interaction(campaign_id, "System", "initializing", "Campaign generation started")
@@ -528,6 +788,10 @@ async def generate_campaign_background(campaign_id: str, campaign_brief: Campaig
         campaign_results[campaign_id]["status"] = "running"
         campaign_results[campaign_id]["message"] = "Campaign generation in progress..."
         
+        await _mirror_campaign_to_redis(campaign_id, include_workflow_steps=True)
+        if getattr(app.state, "redis", None) is not None:
+            mirror_task = asyncio.create_task(_mirror_campaign_while_running(campaign_id))
+        
         # Update progress
         _update_progress(campaign_id, "analyzing_brief", "Campaign Brief Analysis", "Analyzing campaign requirements and objectives")
         
@@ -550,7 +814,7 @@ async def generate_campaign_background(campaign_id: str, campaign_brief: Campaig
         print(f"🚀 Starting campaign generation for {campaign_id} by user {username}")
         
         # Execute workflow step by step for real-time updates
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         
         # Custom step-by-step execution with real-time updates
         result = await loop.run_in_executor(
@@ -569,129 +833,16 @@ async def generate_campaign_background(campaign_id: str, campaign_brief: Campaig
         # Update final progress
         _update_progress(campaign_id, "finalizing", "Finalizing Campaign", "Generating final outputs and artifacts")
         
-        # Generate outputs
-        website_filename = f"{campaign_id}_campaign_website.html"
-        try:
-            # Debug: Print the structure of the result
-            print(f"🔍 Debug: Workflow result keys: {list(result.keys())}")
-            if 'web_developer' in result:
-                print(f"🔍 Debug: web_developer keys: {list(result['web_developer'].keys())}")
-                if 'campaign_website' in result['web_developer']:
-                    html_content = result['web_developer']['campaign_website']
-                    print(f"🔍 Debug: Found HTML content, length: {len(html_content)} characters")
-                    print(f"🔍 Debug: HTML content preview: {html_content[:200]}...")
-                else:
-                    print(f"🔍 Debug: No 'campaign_website' key found in web_developer")
-            else:
-                print(f"🔍 Debug: No 'web_developer' key found in result")
-            
-            create_campaign_website(result, website_filename)
-            print(f"🌐 Website generated: {website_filename}")
-            _log_agent_interaction(campaign_id, "Output Generator", "completed", f"Website generated: {website_filename}")
-        except Exception as e:
-            print(f"⚠️ Warning: Failed to create website: {e}")
-            _log_agent_interaction(campaign_id, "Output Generator", "error", f"Failed to create website: {e}")
-        
-        # Store campaign data in AWS if available
-        s3_urls = {}
-        s3_success = False
-        if hasattr(app.state, 's3_service') and app.state.s3_service:
-            try:
-                # Upload campaign files to S3
-                s3_urls = app.state.s3_service.upload_campaign_files(campaign_id, "outputs")
-                print(f"☁️ Campaign files uploaded to S3: {list(s3_urls.keys())}")
-                s3_success = True
-                
-                # Upload workflow state and artifacts
-                if result.get("artifacts"):
-                    try:
-                        artifacts_url = app.state.s3_service.upload_campaign_artifacts(campaign_id, result)
-                        s3_urls['artifacts'] = artifacts_url
-                        print(f"✅ Artifacts uploaded to S3: {artifacts_url}")
-                    except Exception as e:
-                        print(f"⚠️ Warning: Failed to upload artifacts to S3: {e}")
-                        s3_urls['artifacts'] = None
-                
-                # Upload campaign metadata
-                try:
-                    metadata = {
-                        "campaign_brief": campaign_brief.dict(),
-                        "progress_log": campaign_progress.get(campaign_id, {}),
-                        "agent_interactions": agent_interactions.get(campaign_id, []),
-                        "final_state": result,
-                        "execution_time": execution_time,
-                        "quality_score": len(result.get("artifacts", {})),
-                        "revision_count": result.get("revision_count", 0)
-                    }
-                    metadata_url = app.state.s3_service.upload_campaign_metadata(campaign_id, metadata)
-                    s3_urls['metadata'] = metadata_url
-                    print(f"✅ Metadata uploaded to S3: {metadata_url}")
-                except Exception as e:
-                    print(f"⚠️ Warning: Failed to upload metadata to S3: {e}")
-                    s3_urls['metadata'] = None
-                
-                if s3_success:
-                    _log_agent_interaction(campaign_id, "AWS Storage", "completed", "Campaign data stored in S3 successfully")
-                else:
-                    _log_agent_interaction(campaign_id, "AWS Storage", "partial", "Some S3 uploads failed")
-                
-            except Exception as e:
-                print(f"⚠️ Warning: Failed to upload to S3: {e}")
-                _log_agent_interaction(campaign_id, "AWS Storage", "error", f"Failed to upload to S3: {e}")
-                # Continue with DynamoDB storage even if S3 fails
-        else:
-            print("ℹ️ S3 service not available, skipping S3 uploads")
-        
-        # Store campaign metadata in DynamoDB if available
-        dynamodb_success = False
-        if hasattr(app.state, 'dynamodb_service') and app.state.dynamodb_service:
-            try:
-                campaign_data = {
-                    "campaign_id": campaign_id,
-                    "user_id": username,
-                    "campaign_name": campaign_brief.campaign_name or "Unnamed Campaign",
-                    "status": "completed",
-                    "created_at": datetime.now().isoformat(),
-                    "completed_at": datetime.now().isoformat(),
-                    "execution_time": execution_time,
-                    "s3_website_url": s3_urls.get("website"),
-                    "s3_pdf_url": s3_urls.get("pdf"),
-                    "s3_artifacts_url": s3_urls.get("artifacts"),
-                    "s3_metadata_url": s3_urls.get("metadata"),
-                    "final_state": result
-                }
-                
-                print(f"🗄️ Campaign metadata: {campaign_data}")
-                app.state.dynamodb_service.store_campaign(campaign_data)
-                dynamodb_success = True
-                print(f"🗄️ Campaign metadata stored in DynamoDB successfully")
-                _log_agent_interaction(campaign_id, "DynamoDB Storage", "completed", "Campaign metadata stored successfully")
-                
-                # Verify storage by retrieving the campaign
-                try:
-                    stored_campaign = app.state.dynamodb_service.get_campaign(campaign_id)
-                    if stored_campaign:
-                        print(f"✅ Campaign verification successful - stored in DynamoDB with ID: {stored_campaign.get('campaign_id')}")
-                    else:
-                        print(f"⚠️ Warning: Campaign stored but verification failed")
-                except Exception as e:
-                    print(f"⚠️ Warning: Campaign verification failed: {e}")
-                
-            except Exception as e:
-                print(f"❌ Error: Failed to store in DynamoDB: {e}")
-                _log_agent_interaction(campaign_id, "DynamoDB Storage", "error", f"Failed to store in DynamoDB: {e}")
-        else:
-            print("ℹ️ DynamoDB service not available, skipping DynamoDB storage")
-        
-        # Log overall AWS storage status
-        if s3_success and dynamodb_success:
-            print("🎉 All AWS storage operations completed successfully!")
-        elif dynamodb_success:
-            print("✅ DynamoDB storage completed, S3 storage had issues")
-        elif s3_success:
-            print("✅ S3 storage completed, DynamoDB storage had issues")
-        else:
-            print("❌ All AWS storage operations failed")
+        # Write outputs and persist to AWS on the worker pool (blocking file and boto3 I/O)
+        s3_urls = await loop.run_in_executor(
+            app.state.thread_pool,
+            _persist_campaign_outputs_sync,
+            campaign_id,
+            campaign_brief,
+            username,
+            result,
+            execution_time
+        )
         
         # Update campaign results
         campaign_results[campaign_id].update({
@@ -712,6 +863,8 @@ async def generate_campaign_background(campaign_id: str, campaign_brief: Campaig
         # Final progress update
         _update_progress(campaign_id, "completed", "Campaign Completed", "All artifacts generated successfully")
         _log_agent_interaction(campaign_id, "System", "completed", "Campaign generation completed successfully")
+        await _stop_mirroring(mirror_task)
+        await _mirror_campaign_to_redis(campaign_id, include_workflow_steps=True)
         
         print(f"✅ Campaign {campaign_id} completed in {execution_time:.2f} seconds")
         
@@ -726,11 +879,160 @@ async def generate_campaign_background(campaign_id: str, campaign_brief: Campaig
         
         _log_agent_interaction(campaign_id, "System", "error", error_msg)
         _update_progress(campaign_id, "failed", "Generation Failed", error_msg)
+        await _stop_mirroring(mirror_task)
+        await _mirror_campaign_to_redis(campaign_id, include_workflow_steps=True)
         
         # Don't raise the exception, just log it
         print(f"Campaign {campaign_id} marked as failed")
 
 
+def _persist_campaign_outputs_sync(campaign_id: str, campaign_brief: CampaignBrief, username: str,
+                                   result: Dict, execution_time: float) -> Dict:
+    """
+    Write the campaign website and store campaign data in S3/DynamoDB.
+    
+    Runs on the worker thread pool: file writes and boto3 calls are blocking, so keeping
+    them off the event loop lets progress, SSE and download requests be served meanwhile.
+    
+    Returns:
+        Dictionary of S3 URLs for the uploaded files (empty if S3 is unavailable)
+    """
+    # Generate outputs
+    website_filename = f"{campaign_id}_campaign_website.html"
+    try:
+        # Debug: Print the structure of the result
+        print(f"🔍 Debug: Workflow result keys: {list(result.keys())}")
+        if 'web_developer' in result:
+            print(f"🔍 Debug: web_developer keys: {list(result['web_developer'].keys())}")
+            if 'campaign_website' in result['web_developer']:
+                html_content = result['web_developer']['campaign_website']
+                print(f"🔍 Debug: Found HTML content, length: {len(html_content)} characters")
+                print(f"🔍 Debug: HTML content preview: {html_content[:200]}...")
+            else:
+                print(f"🔍 Debug: No 'campaign_website' key found in web_developer")
+        else:
+            print(f"🔍 Debug: No 'web_developer' key found in result")
+        
+        create_campaign_website(result, website_filename)
+        print(f"🌐 Website generated: {website_filename}")
+        _log_agent_interaction_sync(campaign_id, "Output Generator", "completed", f"Website generated: {website_filename}")
+    except Exception as e:
+        print(f"⚠️ Warning: Failed to create website: {e}")
+        _log_agent_interaction_sync(campaign_id, "Output Generator", "error", f"Failed to create website: {e}")
+    
+    # Store campaign data in AWS if available
+    s3_urls = {}
+    s3_success = False
+    if hasattr(app.state, 's3_service') and app.state.s3_service:
+        s3_service = app.state.s3_service
+        try:
+            # Start the workflow state and metadata uploads; they run on the S3 upload pool
+            # while the campaign files are uploaded below
+            artifacts_future = None
+            if result.get("artifacts"):
+                artifacts_future = s3_service.submit_upload(s3_service.upload_campaign_artifacts, campaign_id, result)
+            
+            metadata = {
+                "campaign_brief": campaign_brief.dict(),
+                "progress_log": campaign_progress.get(campaign_id, {}),
+                "agent_interactions": [_serialize_interaction(i) for i in agent_interactions.get(campaign_id, [])],
+                "final_state": result,
+                "execution_time": execution_time,
+                "quality_score": len(result.get("artifacts", {})),
+                "revision_count": result.get("revision_count", 0)
+            }
+            metadata_future = s3_service.submit_upload(s3_service.upload_campaign_metadata, campaign_id, metadata)
+            
+            # Upload campaign files to S3
+            s3_urls = s3_service.upload_campaign_files(campaign_id, "outputs")
+            print(f"☁️ Campaign files uploaded to S3: {list(s3_urls.keys())}")
+            s3_success = True
+            
+            # Collect workflow state and artifacts
+            if artifacts_future is not None:
+                try:
+                    artifacts_url = artifacts_future.result()
+                    s3_urls['artifacts'] = artifacts_url
+                    print(f"✅ Artifacts uploaded to S3: {artifacts_url}")
+                except Exception as e:
+                    print(f"⚠️ Warning: Failed to upload artifacts to S3: {e}")
+                    s3_urls['artifacts'] = None
+            
+            # Collect campaign metadata
+            try:
+                metadata_url = metadata_future.result()
+                s3_urls['metadata'] = metadata_url
+                print(f"✅ Metadata uploaded to S3: {metadata_url}")
+            except Exception as e:
+                print(f"⚠️ Warning: Failed to upload metadata to S3: {e}")
+                s3_urls['metadata'] = None
+            
+            if s3_success:
+                _log_agent_interaction_sync(campaign_id, "AWS Storage", "completed", "Campaign data stored in S3 successfully")
+            else:
+                _log_agent_interaction_sync(campaign_id, "AWS Storage", "partial", "Some S3 uploads failed")
+            
+        except Exception as e:
+            print(f"⚠️ Warning: Failed to upload to S3: {e}")
+            _log_agent_interaction_sync(campaign_id, "AWS Storage", "error", f"Failed to upload to S3: {e}")
+            # Continue with DynamoDB storage even if S3 fails
+    else:
+        print("ℹ️ S3 service not available, skipping S3 uploads")
+    
+    # Store campaign metadata in DynamoDB if available
+    dynamodb_success = False
+    if hasattr(app.state, 'dynamodb_service') and app.state.dynamodb_service:
+        try:
+            campaign_data = {
+                "campaign_id": campaign_id,
+                "user_id": username,
+                "campaign_name": campaign_brief.campaign_name or "Unnamed Campaign",
+                "status": "completed",
+                "created_at": datetime.now().isoformat(),
+                "completed_at": datetime.now().isoformat(),
+                "execution_time": execution_time,
+                "s3_website_url": s3_urls.get("website"),
+                "s3_pdf_url": s3_urls.get("pdf"),
+                "s3_artifacts_url": s3_urls.get("artifacts"),
+                "s3_metadata_url": s3_urls.get("metadata"),
+                "final_state": result
+            }
+            
+            print(f"🗄️ Campaign metadata: {campaign_data}")
+            app.state.dynamodb_service.store_campaign(campaign_data)
+            dynamodb_success = True
+            print(f"🗄️ Campaign metadata stored in DynamoDB successfully")
+            _log_agent_interaction_sync(campaign_id, "DynamoDB Storage", "completed", "Campaign metadata stored successfully")
+            
+            # Verify storage by retrieving the campaign
+            try:
+                stored_campaign = app.state.dynamodb_service.get_campaign(campaign_id)
+                if stored_campaign:
+                    print(f"✅ Campaign verification successful - stored in DynamoDB with ID: {stored_campaign.get('campaign_id')}")
+                else:
+                    print(f"⚠️ Warning: Campaign stored but verification failed")
+            except Exception as e:
+                print(f"⚠️ Warning: Campaign verification failed: {e}")
+            
+        except Exception as e:
+            print(f"❌ Error: Failed to store in DynamoDB: {e}")
+            _log_agent_interaction_sync(campaign_id, "DynamoDB Storage", "error", f"Failed to store in DynamoDB: {e}")
+    else:
+        print("ℹ️ DynamoDB service not available, skipping DynamoDB storage")
+    
+    # Log overall AWS storage status
+    if s3_success and dynamodb_success:
+        print("🎉 All AWS storage operations completed successfully!")
+    elif dynamodb_success:
+        print("✅ DynamoDB storage completed, S3 storage had issues")
+    elif s3_success:
+        print("✅ S3 storage completed, DynamoDB storage had issues")
+    else:
+        print("❌ All AWS storage operations failed")
+    
+    return s3_urls
+
+
 def execute_workflow_with_updates(workflow, initial_state, campaign_id, config):
     """
     Execute workflow with real-time status updates using monitoring and simulation.
@@ -739,25 +1041,8 @@ def execute_workflow_with_updates(workflow, initial_state, campaign_id, config):
     by monitoring the execution and simulating step-by-step progress.
     """
     try:
-        # Define the workflow steps for progress tracking
-        workflow_steps = [
-            ("project_manager", "Project Manager", "Initializing project and setting objectives"),
-            ("strategy", "Strategy Team", "Developing campaign strategy and positioning"),
-            ("audience_persona", "Audience Persona", "Creating detailed audience personas"),
-            ("creative", "Creative Team", "Generating creative concepts and ideas"),
-            ("copy", "Copy Team", "Writing compelling copy and messaging"),
-            ("cta_optimizer", "CTA Optimizer", "Optimizing calls-to-action"),
-            ("visual", "Visual Team", "Creating visual concepts and mood boards"),
-            ("designer", "Designer Team", "Designing visual assets and layouts"),
-            ("social_media_campaign", "Social Media", "Developing social media campaign"),
-            ("emotion_personalization", "Emotion Personalization", "Adding emotional intelligence"),
-            ("media_planner", "Media Planner", "Planning media strategy and channels"),
-            ("review", "Review Team", "Quality review and validation"),
-            ("campaign_summary", "Campaign Summary", "Creating campaign summary"),
-            ("client_summary", "Client Summary", "Generating client-facing summary"),
-            ("web_developer", "Web Developer", "Building campaign website"),
-            ("html_validation", "HTML Validation", "Validating website code")
-        ]
+        # The workflow steps for progress tracking, from the same definitions get_workflow_steps reports
+        workflow_steps = [(step["id"], step["name"], step["description"]) for step in _WORKFLOW_STEPS_TEMPLATE]
         
         current_step_index = 0
         total_steps = len(workflow_steps)
@@ -789,22 +1074,25 @@ def execute_workflow_with_updates(workflow, initial_state, campaign_id, config):
                 ("html_validation", 6)       # HTML validation
             ]
             
-            total_simulated_time = sum(timing for _, timing in step_timings)
+            # Looked up by step id, so steps without a timing of their own get the default
+            step_timing_by_id = dict(step_timings)
+            total_simulated_time = sum(step_timing_by_id.get(step_id, 10) for step_id, _, _ in workflow_steps)
             print(f"⏱️ Total simulated execution time: {total_simulated_time} seconds")
             
+            elapsed_time = 0
+            
             for i, (step_id, step_name, description) in enumerate(workflow_steps):
                 # Get timing for this step
-                step_timing = step_timings[i][1] if i < len(step_timings) else 10
+                step_timing = step_timing_by_id.get(step_id, 10)
                 
                 # Calculate progress percentage
-                progress_percentage = min(100, int(((i + 1) / len(workflow_steps)) * 100))
+                progress_percentage = _progress_percentage(i + 1, total_steps)
                 
                 # Update progress for this step
                 _update_progress_sync(campaign_id, step_id, step_name, description)
                 _log_agent_interaction_sync(campaign_id, step_name, "started", f"Starting {description}")
                 
                 # Simulate step execution time based on complexity
-                import time
                 time.sleep(step_timing)
                 
                 # Mark step as completed
@@ -815,14 +1103,15 @@ def execute_workflow_with_updates(workflow, initial_state, campaign_id, config):
                 _update_progress_sync(campaign_id, step_id, step_name, f"Completed: {description} in {step_timing}s ({progress_percentage}%)")
                 
                 # Log timing information
-                elapsed_time = sum(timing for _, timing in step_timings[:i+1])
+                elapsed_time += step_timing
                 remaining_time = total_simulated_time - elapsed_time
-                print(f"⏱️ Step {i+1}/17 completed: {step_name} ({step_timing}s) - Total: {elapsed_time}s, Remaining: {remaining_time}s - Progress: {progress_percentage}%")
+                print(f"⏱️ Step {i+1}/{total_steps} completed: {step_name} ({step_timing}s) - Total: {elapsed_time}s, Remaining: {remaining_time}s - Progress: {progress_percentage}%")
                 
                 # Update campaign results with current progress
-                if campaign_id in campaign_results:
-                    campaign_results[campaign_id]["execution_time"] = elapsed_time
-                    campaign_results[campaign_id]["progress_percentage"] = progress_percentage
+                result = campaign_results.get(campaign_id)
+                if result is not None:
+                    result["execution_time"] = elapsed_time
+                    result["progress_percentage"] = progress_percentage
         
         # Run progress simulation in a separate thread
         import threading
@@ -864,22 +1153,33 @@ def _update_progress_sync(campaign_id: str, step: str, step_name: str, descripti
         })
         
         # Increment completed steps for certain milestones
-        if step in ["project_manager", "strategy", "audience_persona", "creative", "copy", 
-                    "cta_optimizer", "visual", "designer", "social_media_campaign", 
-                    "emotion_personalization", "media_planner", "review", "campaign_summary", 
-                    "client_summary", "web_developer", "html_validation"]:
+        if step in _MILESTONE_STEPS_SYNC:
             current_progress["completed_steps"] = min(current_progress["completed_steps"] + 1, current_progress["total_steps"])
         
-        print(f"📊 Progress update for {campaign_id}: {step_name} - {description}")
+        _bump_version(campaign_id)
+        logger.debug("📊 Progress update for %s: %s - %s", campaign_id, step_name, description)
+
+
+def _publish_partial_artifact(campaign_id: str, artifact_name: str, text: str):
+    """Expose an artifact that is still streaming in on the campaign's live results (called from workflow threads)"""
+    result = campaign_results.get(campaign_id)
+    if result is None:
+        return
+    # Swap in a new dict so a request serializing the old one never sees it change
+    result["artifacts"] = {**result.get("artifacts", {}), artifact_name: text}
+    _bump_version(campaign_id)
+
+
+def _bump_version(campaign_id: str):
+    """Mark a campaign's state as changed so cached views of it are recomputed"""
+    campaign_versions[campaign_id] = next(_version_counter)
 
 
 def _log_agent_interaction_sync(campaign_id: str, agent: str, action: str, message: str):
     """Log agent interactions synchronously (for use in separate thread)"""
-    if campaign_id not in agent_interactions:
-        agent_interactions[campaign_id] = []
-    
     interaction = {
-        "timestamp": datetime.now().isoformat(),
+        "_seq": next(_interaction_seq),
+        "_ts_ns": time.time_ns(),  # formatted to ISO only when read, see _serialize_interaction
         "agent": agent,
         "action": action,
         "message": message,
@@ -887,7 +1187,11 @@ def _log_agent_interaction_sync(campaign_id: str, agent: str, action: str, messa
     }
     
     agent_interactions[campaign_id].append(interaction)
-    print(f"🤖 Agent interaction logged: {agent} - {action} - {message}")
+    interaction_counts[campaign_id][interaction["status"]] += 1
+    if action == "completed" and "generated" in message.lower():
+        campaign_last_generated[campaign_id] = interaction["_ts_ns"]
+    _bump_version(campaign_id)
+    logger.debug("🤖 Agent interaction logged: %s - %s - %s", agent, action, message)
 
 
 def _update_progress(campaign_id: str, step: str, step_name: str, description: str):
@@ -902,19 +1206,18 @@ def _update_progress(campaign_id: str, step: str, step_name: str, description: s
         })
         
         # Increment completed steps for certain milestones
-        if step in ["analyzing_brief", "content_generation", "design_creation", "review_process", "finalizing"]:
+        if step in _MILESTONE_STEPS_ASYNC:
             current_progress["completed_steps"] = min(current_progress["completed_steps"] + 1, current_progress["total_steps"])
         
-        print(f"📊 Progress update for {campaign_id}: {step_name} - {description}")
+        _bump_version(campaign_id)
+        logger.debug("📊 Progress update for %s: %s - %s", campaign_id, step_name, description)
 
 
 def _log_agent_interaction(campaign_id: str, agent: str, action: str, message: str):
     """Log agent interactions for real-time monitoring (for async functions)"""
-    if campaign_id not in agent_interactions:
-        agent_interactions[campaign_id] = []
-    
     interaction = {
-        "timestamp": datetime.now().isoformat(),
+        "_seq": next(_interaction_seq),
+        "_ts_ns": time.time_ns(),  # formatted to ISO only when read, see _serialize_interaction
         "agent": agent,
         "action": action,
         "message": message,
@@ -922,17 +1225,169 @@ def _log_agent_interaction(campaign_id: str, agent: str, action: str, message: s
     }
     
     agent_interactions[campaign_id].append(interaction)
-    print(f"🤖 Agent interaction logged: {agent} - {action} - {message}")
+    interaction_counts[campaign_id][interaction["status"]] += 1
+    if action == "completed" and "generated" in message.lower():
+        campaign_last_generated[campaign_id] = interaction["_ts_ns"]
+    _bump_version(campaign_id)
+    logger.debug("🤖 Agent interaction logged: %s - %s - %s", agent, action, message)
+
+
+def _format_timestamp_ns(timestamp_ns: int) -> str:
+    """Format a time.time_ns() value as a local ISO timestamp"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
+
+@lru_cache(maxsize=4)
+def _iso_for_second(epoch_second: int) -> str:
+    """Format a whole epoch second as a local ISO timestamp (cached, so polls within a second share it)"""
+    return datetime.fromtimestamp(epoch_second).isoformat()
+
+
+def _iso_now() -> str:
+    """Current local time as an ISO timestamp at one-second resolution"""
+    return _iso_for_second(int(time.time()))
+
+
+def _serialize_interaction(interaction: Dict) -> Dict:
+    """Return the public form of a logged interaction, with its ISO timestamp filled in"""
+    public = {key: value for key, value in interaction.items() if not key.startswith("_")}
+    public["timestamp"] = _format_timestamp_ns(interaction["_ts_ns"])
+    return public
+
+
+def _refresh_campaign_file_index():
+    """Rescan the outputs directory if its mtime changed since the last scan"""
+    global _campaign_file_index, _outputs_mtime_ns
+    
+    try:
+        mtime_ns = os.stat(OUTPUTS_DIR).st_mtime_ns
+    except FileNotFoundError:
+        _campaign_file_index, _outputs_mtime_ns = {}, None
+        return
+    
+    if mtime_ns == _outputs_mtime_ns:
+        return
+    
+    index = {}
+    with os.scandir(OUTPUTS_DIR) as entries:
+        for entry in entries:
+            match = _WEBSITE_FILE_RE.match(entry.name)
+            if match:
+                # Names are timestamp-prefixed, so the greatest name is the latest file
+                campaign_key = match.group(1)
+                if entry.name > index.get(campaign_key, ""):
+                    index[campaign_key] = entry.name
+    
+    _campaign_file_index = {key: os.path.join(OUTPUTS_DIR, name) for key, name in index.items()}
+    _outputs_mtime_ns = mtime_ns
+
+
+def _latest_website_file(campaign_id: str) -> Optional[str]:
+    """Return the path of the latest generated website for a campaign, if any"""
+    _refresh_campaign_file_index()
+    return _campaign_file_index.get(campaign_id)
+
+
+async def _mirror_campaign_to_redis(campaign_id: str, include_workflow_steps: bool = False):
+    """Copy a campaign's record (and, once finished, its workflow steps JSON) to Redis for other workers"""
+    redis_client = getattr(app.state, "redis", None)
+    if redis_client is None:
+        return
+    
+    try:
+        await redis_client.set(
+            f"campaign:{campaign_id}",
+            orjson.dumps(campaign_results[campaign_id], default=str, option=orjson.OPT_NON_STR_KEYS),
+            ex=REDIS_CAMPAIGN_TTL_SECONDS
+        )
+        if include_workflow_steps:
+            payload = _workflow_steps_payload(campaign_id, campaign_versions.get(campaign_id, 0))
+            await redis_client.set(
+                f"campaign:{campaign_id}:workflow_steps",
+                orjson.dumps({"campaign_id": campaign_id, **payload, "last_update": datetime.now()}),
+                ex=REDIS_CAMPAIGN_TTL_SECONDS
+            )
+    except Exception as e:
+        print(f"⚠️ Warning: Failed to mirror campaign {campaign_id} to Redis: {e}")
+
+
+async def _mirror_campaign_while_running(campaign_id: str):
+    """Re-mirror a running campaign to Redis whenever its state version changes, so other workers can poll it"""
+    mirrored_version = campaign_versions.get(campaign_id, 0)
+    while True:
+        await asyncio.sleep(REDIS_MIRROR_INTERVAL_SECONDS)
+        version = campaign_versions.get(campaign_id, 0)
+        if version != mirrored_version:
+            mirrored_version = version
+            await _mirror_campaign_to_redis(campaign_id, include_workflow_steps=True)
+
+
+async def _stop_mirroring(mirror_task: Optional[asyncio.Task]):
+    """Stop a running-campaign mirror task, so it can't overwrite the final mirror with an older one"""
+    if mirror_task is None:
+        return
+    mirror_task.cancel()
+    try:
+        await mirror_task
+    except asyncio.CancelledError:
+        pass
+
+
+async def _get_campaign_record(campaign_id: str) -> Optional[Dict]:
+    """Return a campaign record from this process, falling back to the Redis mirror"""
+    result = campaign_results.get(campaign_id)
+    if result is not None:
+        return result
+    
+    redis_client = getattr(app.state, "redis", None)
+    if redis_client is None:
+        return None
+    
+    try:
+        raw = await redis_client.get(f"campaign:{campaign_id}")
+    except Exception as e:
+        print(f"⚠️ Warning: Failed to read campaign {campaign_id} from Redis: {e}")
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def _get_mirrored_workflow_steps(campaign_id: str) -> Optional[bytes]:
+    """Return the workflow steps JSON another worker mirrored to Redis, if any"""
+    redis_client = getattr(app.state, "redis", None)
+    if redis_client is None:
+        return None
+    
+    try:
+        return await redis_client.get(f"campaign:{campaign_id}:workflow_steps")
+    except Exception as e:
+        print(f"⚠️ Warning: Failed to read workflow steps for {campaign_id} from Redis: {e}")
+        return None
+
+
+@lru_cache(maxsize=128)
+def _match_artifacts_to_steps(artifact_names: tuple) -> tuple:
+    """
+    Attribute artifacts to workflow steps by id/name substring, lowercasing each artifact once.
+    
+    This is a simplified mapping - in a real implementation you'd track which agent generated
+    which artifacts. Returns one tuple of matching artifact names per workflow step.
+    """
+    matches = [[] for _ in _WORKFLOW_STEP_KEYS]
+    for artifact_name in artifact_names:
+        artifact_lower = artifact_name.lower()
+        for index, (step_id, step_name) in enumerate(_WORKFLOW_STEP_KEYS):
+            if step_id in artifact_lower or step_name in artifact_lower:
+                matches[index].append(artifact_name)
+    return tuple(tuple(step_matches) for step_matches in matches)
 
 
 @app.get("/api/v1/campaigns/{campaign_id}", response_model=CampaignResponse)
 async def get_campaign(campaign_id: str, current_user: User = Depends(get_current_active_user)):
     """Get campaign results and status (authentication required)"""
-    if campaign_id not in campaign_results:
+    result = campaign_results.get(campaign_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
-    result = campaign_results[campaign_id]
-    
     # Check if user owns the campaign or is admin
     if result.get("created_by") != current_user.username and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied. You can only view your own campaigns.")
@@ -943,7 +1398,8 @@ async def get_campaign(campaign_id: str, current_user: User = Depends(get_curren
 @app.get("/api/v1/campaigns/{campaign_id}/status", response_model=CampaignStatus)
 async def get_campaign_status(campaign_id: str, current_user: User = Depends(get_current_active_user)):
     """Get campaign status and progress (authentication required)"""
-    if campaign_id not in campaign_status:
+    status = campaign_status.get(campaign_id, _MISSING)
+    if status is _MISSING:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
     result = campaign_results.get(campaign_id, {})
@@ -952,8 +1408,6 @@ async def get_campaign_status(campaign_id: str, current_user: User = Depends(get
     if result.get("created_by") != current_user.username and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied. You can only view your own campaigns.")
     
-    status = campaign_status[campaign_id]
-    
     progress = None
     if status == "running":
         progress = {
@@ -974,44 +1428,51 @@ async def get_campaign_status(campaign_id: str, current_user: User = Depends(get
 async def get_all_campaigns_progress(current_user: User = Depends(get_current_active_user)):
     """Get progress of all campaigns for the current user (non-blocking)"""
     user_campaigns = []
+    completed = running = failed = 0
     
-    for campaign_id, result in campaign_results.items():
+    # Snapshot entries so a campaign started mid-request can't change the dict under iteration
+    for campaign_id, result in list(campaign_results.items()):
         # Filter campaigns based on user role
         if current_user.role == "admin" or result.get("created_by") == current_user.username:
+            status = result.get("status", "unknown")
             campaign_info = {
                 "campaign_id": campaign_id,
-                "status": result.get("status", "unknown"),
+                "status": status,
                 "created_at": result.get("created_at"),
                 "progress": {
-                    "artifacts_generated": len(result.get("artifacts", {})),
+                    "artifacts_generated": len(result.get("artifacts") or {}),
                     "revision_count": result.get("revision_count", 0),
                     "execution_time": result.get("execution_time", 0)
                 }
             }
             
-            if result.get("status") == "completed":
+            if status == "completed":
+                completed += 1
                 campaign_info["completed_at"] = result.get("completed_at")
                 campaign_info["quality_score"] = result.get("quality_score")
+            elif status == "running":
+                running += 1
+            elif status == "failed":
+                failed += 1
             
             user_campaigns.append(campaign_info)
     
     return {
         "campaigns": user_campaigns,
         "total": len(user_campaigns),
-        "completed": len([c for c in user_campaigns if c["status"] == "completed"]),
-        "running": len([c for c in user_campaigns if c["status"] == "running"]),
-        "failed": len([c for c in user_campaigns if c["status"] == "failed"])
+        "completed": completed,
+        "running": running,
+        "failed": failed
     }
 
 
 @app.get("/api/v1/campaigns/{campaign_id}/website")
 async def download_website(campaign_id: str, current_user: User = Depends(get_current_active_user)):
     """Download the generated campaign website (authentication required)"""
-    if campaign_id not in campaign_results:
+    result = campaign_results.get(campaign_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
-    result = campaign_results[campaign_id]
-    
     # Check if user owns the campaign or is admin
     if result.get("created_by") != current_user.username and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied. You can only download your own campaigns.")
@@ -1019,19 +1480,11 @@ async def download_website(campaign_id: str, current_user: User = Depends(get_cu
     if result["status"] != "completed":
         raise HTTPException(status_code=400, detail="Campaign generation not completed")
     
-    # Find the website file
-    outputs_dir = "outputs"
-    website_files = [f for f in os.listdir(outputs_dir) if f.endswith("_campaign_website.html")]
-    
-    # Find the most recent file for this campaign
-    campaign_files = [f for f in website_files if campaign_id in f]
-    if not campaign_files:
+    # Find the most recent website file for this campaign
+    file_path = _latest_website_file(campaign_id)
+    if not file_path:
         raise HTTPException(status_code=404, detail="Website file not found")
     
-    # Get the most recent file
-    latest_file = sorted(campaign_files)[-1]
-    file_path = os.path.join(outputs_dir, latest_file)
-    
     return FileResponse(
         path=file_path,
         media_type="text/html",
@@ -1042,11 +1495,10 @@ async def download_website(campaign_id: str, current_user: User = Depends(get_cu
 @app.get("/api/v1/campaigns/{campaign_id}/pdf")
 async def download_pdf(campaign_id: str, current_user: User = Depends(get_current_active_user)):
     """Download the generated campaign PDF report (authentication required)"""
-    if campaign_id not in campaign_results:
+    result = campaign_results.get(campaign_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
-    result = campaign_results[campaign_id]
-    
     # Check if user owns the campaign or is admin
     if result.get("created_by") != current_user.username and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied. You can only download your own campaigns.")
@@ -1054,18 +1506,17 @@ async def download_pdf(campaign_id: str, current_user: User = Depends(get_curren
     if result["status"] != "completed":
         raise HTTPException(status_code=400, detail="Campaign generation not completed")
     
-    # Find the PDF file
-    outputs_dir = "outputs"
-    pdf_files = [f for f in os.listdir(outputs_dir) if f.endswith(".pdf")]
-    
-    # Find the most recent PDF file for this campaign
-    campaign_files = [f for f in pdf_files if campaign_id in f]
+    # Find this campaign's PDF files in a single directory pass
+    with os.scandir(OUTPUTS_DIR) as entries:
+        campaign_files = [
+            entry for entry in entries
+            if entry.name.endswith(".pdf") and campaign_id in entry.name and entry.is_file(follow_symlinks=False)
+        ]
     if not campaign_files:
         raise HTTPException(status_code=404, detail="PDF file not found")
     
-    # Get the most recent file
-    latest_file = sorted(campaign_files)[-1]
-    file_path = os.path.join(outputs_dir, latest_file)
+    # Get the most recent file (names are timestamp-prefixed, so the max is the latest)
+    file_path = max(campaign_files, key=lambda entry: entry.name).path
     
     return FileResponse(
         path=file_path,
@@ -1078,36 +1529,45 @@ async def download_pdf(campaign_id: str, current_user: User = Depends(get_curren
 async def list_campaigns(current_user: User = Depends(get_current_active_user)):
     """List all campaigns with their status (authentication required)"""
     campaigns = []
-    for campaign_id, result in campaign_results.items():
+    completed = running = failed = 0
+    # Snapshot entries so a campaign started mid-request can't change the dict under iteration
+    for campaign_id, result in list(campaign_results.items()):
         # Filter campaigns based on user role
         if current_user.role == "admin" or result.get("created_by") == current_user.username:
+            status = result.get("status", "unknown")
+            if status == "completed":
+                completed += 1
+            elif status == "running":
+                running += 1
+            elif status == "failed":
+                failed += 1
+            
             campaigns.append({
                 "campaign_id": campaign_id,
-                "status": result.get("status", "unknown"),
+                "status": status,
                 "created_at": result.get("created_at"),
                 "completed_at": result.get("completed_at"),
                 "execution_time": result.get("execution_time"),
-                "artifacts_count": len(result.get("artifacts", {})),
+                "artifacts_count": len(result.get("artifacts") or {}),
                 "created_by": result.get("created_by", "unknown")
             })
     
     return {
         "campaigns": campaigns,
         "total": len(campaigns),
-        "completed": len([c for c in campaigns if c["status"] == "completed"]),
-        "running": len([c for c in campaigns if c["status"] == "running"]),
-        "failed": len([c for c in campaigns if c["status"] == "failed"])
+        "completed": completed,
+        "running": running,
+        "failed": failed
     }
 
 
 @app.get("/api/v1/campaigns/{campaign_id}/progress", response_model=Dict[str, Any])
 async def get_campaign_progress(campaign_id: str, current_user: User = Depends(get_current_active_user)):
     """Get real-time campaign progress and agent interactions (authentication required)"""
-    if campaign_id not in campaign_results:
+    result = campaign_results.get(campaign_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
-    result = campaign_results.get(campaign_id, {})
-    
     # Check if user owns the campaign or is admin
     if result.get("created_by") != current_user.username and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied. You can only view your own campaigns.")
@@ -1122,7 +1582,7 @@ async def get_campaign_progress(campaign_id: str, current_user: User = Depends(g
         "completed_steps": 0,
         "current_agent": None,
         "step_description": "Initializing campaign generation...",
-        "last_update": datetime.now().isoformat()
+        "last_update": _iso_now()
     })
     
     # Update progress step based on actual status
@@ -1137,12 +1597,11 @@ async def get_campaign_progress(campaign_id: str, current_user: User = Depends(g
         progress["step_description"] = result.get("message", "Campaign generation failed")
     
     # Get agent interactions
-    interactions = agent_interactions.get(campaign_id, [])
+    # Snapshot the bounded log so appends from the workflow thread can't disturb iteration
+    interactions = list(agent_interactions.get(campaign_id, ()))
     
     # Calculate progress percentage
-    progress_percentage = 0
-    if progress["total_steps"] > 0:
-        progress_percentage = min(100, int((progress["completed_steps"] / progress["total_steps"]) * 100))
+    progress_percentage = _progress_percentage(progress["completed_steps"], progress["total_steps"])
     
     # Get current step details with timing information
     current_step_details = {
@@ -1157,8 +1616,11 @@ async def get_campaign_progress(campaign_id: str, current_user: User = Depends(g
         "estimated_remaining_time": max(0, 300 - result.get("execution_time", 0))
     }
     
-    # Get recent interactions (last 10)
-    recent_interactions = interactions[-10:] if len(interactions) > 10 else interactions
+    # Get recent interactions (last 10), formatting timestamps only for the returned slice
+    recent_interactions = [
+        _serialize_interaction(i)
+        for i in islice(interactions, max(0, len(interactions) - 10), None)
+    ]
     
     # Get artifacts summary
     artifacts = result.get("artifacts", {})
@@ -1168,12 +1630,10 @@ async def get_campaign_progress(campaign_id: str, current_user: User = Depends(g
         "last_generated": None
     }
     
-    if artifacts and interactions:
-        # Find the last artifact generation interaction
-        for interaction in reversed(interactions):
-            if interaction.get("action") == "completed" and "generated" in interaction.get("message", "").lower():
-                artifacts_summary["last_generated"] = interaction.get("timestamp")
-                break
+    # Last artifact generation time is tracked as interactions are logged
+    last_generated_ns = campaign_last_generated.get(campaign_id)
+    if artifacts and last_generated_ns is not None:
+        artifacts_summary["last_generated"] = _format_timestamp_ns(last_generated_ns)
     
     return {
         "campaign_id": campaign_id,
@@ -1183,8 +1643,8 @@ async def get_campaign_progress(campaign_id: str, current_user: User = Depends(g
         "artifacts_summary": artifacts_summary,
         "revision_count": result.get("revision_count", 0),
         "execution_time": result.get("execution_time", 0),
-        "last_update": datetime.now().isoformat(),
-        "estimated_completion": _estimate_completion_time(campaign_id, progress_percentage),
+        "last_update": _iso_now(),
+        "estimated_completion": _estimate_completion_time(result, progress_percentage),
         "workflow_health": _assess_workflow_health(campaign_id, interactions),
         "timing_info": {
             "total_estimated_time": 200,
@@ -1197,14 +1657,23 @@ async def get_campaign_progress(campaign_id: str, current_user: User = Depends(g
     }
 
 
-def _estimate_completion_time(campaign_id: str, progress_percentage: int) -> Optional[str]:
+def _progress_percentage(completed_steps: int, total_steps: int) -> int:
+    """Integer completion percentage, using the precomputed table for the usual 17 steps"""
+    if total_steps == 17:
+        return _PROGRESS_PCT_17[min(max(completed_steps, 0), 17)]
+    if total_steps <= 0:
+        return 0
+    return min(100, int((completed_steps / total_steps) * 100))
+
+
+def _estimate_completion_time(result: Dict, progress_percentage: int) -> Optional[str]:
     """Estimate completion time based on current progress"""
     if progress_percentage == 0 or progress_percentage >= 100:
         return None
     
     # Get campaign start time
-    if campaign_id in campaign_results:
-        start_time_str = campaign_results[campaign_id].get("created_at")
+    if result:
+        start_time_str = result.get("created_at")
         if start_time_str:
             try:
                 start_time = datetime.fromisoformat(start_time_str)
@@ -1236,10 +1705,11 @@ def _assess_workflow_health(campaign_id: str, interactions: List[Dict]) -> Dict[
     if not interactions:
         return {"status": "unknown", "issues": [], "performance": "unknown"}
     
-    # Count different types of interactions
-    total_interactions = len(interactions)
-    successful_interactions = len([i for i in interactions if i.get("status") == "success"])
-    error_interactions = len([i for i in interactions if i.get("status") == "error"])
+    # Read the tallies maintained at append time instead of rescanning the log
+    counts = interaction_counts.get(campaign_id, Counter())
+    successful_interactions = counts["success"]
+    error_interactions = counts["error"]
+    total_interactions = successful_interactions + error_interactions
     
     # Calculate success rate
     success_rate = (successful_interactions / total_interactions * 100) if total_interactions > 0 else 0
@@ -1255,10 +1725,9 @@ def _assess_workflow_health(campaign_id: str, interactions: List[Dict]) -> Dict[
     # Check for stuck workflows
     if total_interactions > 0:
         last_interaction = interactions[-1]
-        last_timestamp = datetime.fromisoformat(last_interaction["timestamp"])
-        time_since_last = datetime.now() - last_timestamp
+        ns_since_last = time.time_ns() - last_interaction["_ts_ns"]
         
-        if time_since_last.total_seconds() > 300:  # 5 minutes
+        if ns_since_last > 300 * 1_000_000_000:  # 5 minutes
             issues.append("Workflow appears to be stuck")
     
     # Determine overall health status
@@ -1277,17 +1746,21 @@ def _assess_workflow_health(campaign_id: str, interactions: List[Dict]) -> Dict[
         "total_interactions": total_interactions,
         "error_count": error_interactions,
         "issues": issues,
-        "last_activity": interactions[-1]["timestamp"] if interactions else None
+        "last_activity": _format_timestamp_ns(interactions[-1]["_ts_ns"]) if interactions else None
     }
 
 
 @app.get("/api/v1/campaigns/{campaign_id}/stream")
-async def stream_campaign_updates(campaign_id: str, current_user: User = Depends(get_current_active_user)):
-    """Stream real-time campaign updates using Server-Sent Events (SSE)"""
-    if campaign_id not in campaign_results:
-        raise HTTPException(status_code=404, detail="Campaign not found")
+async def stream_campaign_updates(campaign_id: str, request: Request, current_user: User = Depends(get_current_active_user)):
+    """
+    Stream real-time campaign updates using Server-Sent Events (SSE)
     
-    result = campaign_results.get(campaign_id, {})
+    Events are unnamed so EventSource.onmessage receives them all; clients switch on the
+    payload's "type" (interaction, progress, completion, error).
+    """
+    result = campaign_results.get(campaign_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
     
     # Check if user owns the campaign or is admin
     if result.get("created_by") != current_user.username and current_user.role != "admin":
@@ -1295,23 +1768,32 @@ async def stream_campaign_updates(campaign_id: str, current_user: User = Depends
     
     async def generate_updates():
         """Generate real-time updates for the campaign"""
-        last_interaction_count = 0
+        last_interaction_seq = 0
         last_progress_update = None
         
         while True:
+            # Stop polling as soon as the client goes away
+            if await request.is_disconnected():
+                break
+            
             try:
-                # Get current progress and interactions
+                # Get current progress and interactions, reading the campaign record once per tick
+                result = campaign_results.get(campaign_id, {})
                 progress = campaign_progress.get(campaign_id, {})
                 interactions = agent_interactions.get(campaign_id, [])
-                current_status = campaign_results.get(campaign_id, {}).get("status", "unknown")
+                current_status = result.get("status", "unknown")
                 
-                # Check if there are new interactions
-                if len(interactions) > last_interaction_count:
-                    new_interactions = interactions[last_interaction_count:]
-                    last_interaction_count = len(interactions)
+                # Send interactions logged since the last one sent, from a snapshot of the log (it is
+                # appended to from worker threads); sequence numbers survive eviction from the bounded log
+                new_interactions = [
+                    interaction for interaction in list(interactions)
+                    if interaction["_seq"] > last_interaction_seq
+                ]
+                if new_interactions:
+                    last_interaction_seq = new_interactions[-1]["_seq"]
                     
                     for interaction in new_interactions:
-                        yield f"data: {interaction}\n\n"
+                        yield {"data": json.dumps({"type": "interaction", **_serialize_interaction(interaction)})}
                 
                 # Check if progress has been updated
                 current_progress_key = f"{progress.get('current_step', '')}_{progress.get('step_name', '')}_{progress.get('completed_steps', 0)}"
@@ -1320,225 +1802,108 @@ async def stream_campaign_updates(campaign_id: str, current_user: User = Depends
                     
                     progress_update = {
                         "type": "progress",
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": _iso_now(),
                         "progress": progress,
                         "status": current_status
                     }
-                    yield f"data: {progress_update}\n\n"
+                    yield {"data": json.dumps(progress_update)}
                 
                 # Check if campaign is completed or failed
                 if current_status in ["completed", "failed"]:
                     final_update = {
                         "type": "completion",
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": _iso_now(),
                         "status": current_status,
                         "message": "Campaign generation completed" if current_status == "completed" else "Campaign generation failed"
                     }
-                    yield f"data: {final_update}\n\n"
+                    yield {"data": json.dumps(final_update)}
                     break
                 
-                # Send heartbeat to keep connection alive
-                yield f"data: {{\"type\": \"heartbeat\", \"timestamp\": \"{datetime.now().isoformat()}\"}}\n\n"
-                
-                # Wait before next update
+                # Wait before next update (keepalive pings are sent by EventSourceResponse)
                 await asyncio.sleep(1)
                 
             except Exception as e:
                 error_update = {
                     "type": "error",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _iso_now(),
                     "error": str(e)
                 }
-                yield f"data: {error_update}\n\n"
+                yield {"data": json.dumps(error_update)}
                 break
     
-    return StreamingResponse(
-        generate_updates(),
-        media_type="text/plain",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Content-Type": "text/event-stream",
-        }
-    )
+    return EventSourceResponse(generate_updates(), ping=15)
 
 
-@app.get("/api/v1/campaigns/{campaign_id}/workflow-steps")
-async def get_workflow_steps(campaign_id: str, current_user: User = Depends(get_current_active_user)):
-    """Get detailed information about all workflow steps and their status"""
-    if campaign_id not in campaign_results:
-        raise HTTPException(status_code=404, detail="Campaign not found")
+@lru_cache(maxsize=256)
+def _workflow_steps_payload(campaign_id: str, version: int) -> Dict[str, Any]:
+    """
+    Build the workflow steps and statistics for a campaign.
     
+    Cached per (campaign_id, version); the version changes whenever the campaign's progress,
+    interactions or results change, so repeated polls between updates reuse the same payload.
+    """
     result = campaign_results.get(campaign_id, {})
     
-    # Check if user owns the campaign or is admin
-    if result.get("created_by") != current_user.username and current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Access denied. You can only view your own campaigns.")
-    
-    # Define all workflow steps
-    workflow_steps = [
-        {
-            "id": "project_manager",
-            "name": "Project Manager",
-            "description": "Initializing project and setting objectives",
-            "order": 1,
-            "category": "planning"
-        },
-        {
-            "id": "strategy",
-            "name": "Strategy Team",
-            "description": "Developing campaign strategy and positioning",
-            "order": 2,
-            "category": "planning"
-        },
-        {
-            "id": "audience_persona",
-            "name": "Audience Persona",
-            "description": "Creating detailed audience personas",
-            "order": 3,
-            "category": "research"
-        },
-        {
-            "id": "creative",
-            "name": "Creative Team",
-            "description": "Generating creative concepts and ideas",
-            "order": 4,
-            "category": "creative"
-        },
-        {
-            "id": "copy",
-            "name": "Copy Team",
-            "description": "Writing compelling copy and messaging",
-            "order": 5,
-            "category": "creative"
-        },
-        {
-            "id": "cta_optimizer",
-            "name": "CTA Optimizer",
-            "description": "Optimizing calls-to-action",
-            "order": 6,
-            "category": "optimization"
-        },
-        {
-            "id": "visual",
-            "name": "Visual Team",
-            "description": "Creating visual concepts and mood boards",
-            "order": 7,
-            "category": "design"
-        },
-        {
-            "id": "designer",
-            "name": "Designer Team",
-            "description": "Designing visual assets and layouts",
-            "order": 8,
-            "category": "design"
-        },
-        {
-            "id": "social_media_campaign",
-            "name": "Social Media",
-            "description": "Developing social media campaign",
-            "order": 9,
-            "category": "execution"
-        },
-        {
-            "id": "emotion_personalization",
-            "name": "Emotion Personalization",
-            "description": "Adding emotional intelligence",
-            "order": 10,
-            "category": "optimization"
-        },
-        {
-            "id": "media_planner",
-            "name": "Media Planner",
-            "description": "Planning media strategy and channels",
-            "order": 11,
-            "category": "planning"
-        },
-        {
-            "id": "review",
-            "name": "Review Team",
-            "description": "Quality review and validation",
-            "order": 12,
-            "category": "quality"
-        },
-        {
-            "id": "campaign_summary",
-            "name": "Campaign Summary",
-            "description": "Creating campaign summary",
-            "order": 13,
-            "category": "documentation"
-        },
-        {
-            "id": "client_summary",
-            "name": "Client Summary",
-            "description": "Generating client-facing summary",
-            "order": 14,
-            "category": "documentation"
-        },
-        {
-            "id": "web_developer",
-            "name": "Web Developer",
-            "description": "Building campaign website",
-            "order": 15,
-            "category": "execution"
-        },
-        {
-            "id": "html_validation",
-            "name": "HTML Validation",
-            "description": "Validating website code",
-            "order": 16,
-            "category": "quality"
-        }
-    ]
-    
     # Get current progress and interactions
     progress = campaign_progress.get(campaign_id, {})
-    interactions = agent_interactions.get(campaign_id, [])
+    # Snapshot the bounded log so appends from the workflow thread can't disturb iteration
+    interactions = list(agent_interactions.get(campaign_id, ()))
     current_status = result.get("status", "unknown")
     
-    # Enhance each step with status information
-    for step in workflow_steps:
+    # Group interactions by agent in a single pass instead of rescanning the log per step
+    interactions_by_agent = {}
+    for interaction in interactions:
+        agent = interaction.get("agent")
+        if agent in _WORKFLOW_STEP_NAMES:
+            interactions_by_agent.setdefault(agent, []).append(interaction)
+    
+    # Artifact attribution only changes when the set of artifact names does
+    artifact_matches = _match_artifacts_to_steps(tuple(result.get("artifacts") or {}))
+    
+    # Enhance each step with status information, tallying statuses as they are assigned
+    workflow_steps = []
+    status_counts = [0] * len(StepStatus)
+    for index, template in enumerate(_WORKFLOW_STEPS_TEMPLATE):
+        step = dict(template)
+        workflow_steps.append(step)
         step_id = step["id"]
         
         # Check if step is completed
-        step_interactions = [i for i in interactions if i.get("agent") == step["name"]]
+        step_interactions = interactions_by_agent.get(step["name"], [])
         completed_interactions = [i for i in step_interactions if i.get("action") == "completed"]
         error_interactions = [i for i in step_interactions if i.get("action") == "error"]
         
         # Determine step status
         if completed_interactions:
-            step["status"] = "completed"
-            step["completed_at"] = completed_interactions[-1].get("timestamp")
+            step_status = StepStatus.COMPLETED
+            step["completed_at"] = _format_timestamp_ns(completed_interactions[-1]["_ts_ns"])
             step["execution_time"] = None  # Could calculate if needed
         elif error_interactions:
-            step["status"] = "failed"
+            step_status = StepStatus.FAILED
             step["error_message"] = error_interactions[-1].get("message")
         elif step_id == progress.get("current_step"):
-            step["status"] = "running"
+            step_status = StepStatus.RUNNING
             step["started_at"] = progress.get("last_update")
         else:
-            step["status"] = "pending"
+            step_status = StepStatus.PENDING
+        step["status"] = _STEP_STATUS_NAMES[step_status]
+        status_counts[step_status] += 1
         
         # Add interaction count
         step["interaction_count"] = len(step_interactions)
         step["error_count"] = len(error_interactions)
         
         # Add artifacts generated by this step
-        artifacts = result.get("artifacts", {})
-        step_artifacts = []
-        for artifact_name, artifact_data in artifacts.items():
-            # This is a simplified mapping - in a real implementation you'd track which agent generated which artifacts
-            if step_id in artifact_name.lower() or step["name"].lower() in artifact_name.lower():
-                step_artifacts.append(artifact_name)
+        step_artifacts = list(artifact_matches[index])
         
         step["artifacts_generated"] = step_artifacts
         step["artifacts_count"] = len(step_artifacts)
     
     # Calculate overall workflow statistics
-    completed_steps = len([s for s in workflow_steps if s["status"] == "completed"])
-    failed_steps = len([s for s in workflow_steps if s["status"] == "failed"])
-    running_steps = len([s for s in workflow_steps if s["status"] == "running"])
-    pending_steps = len([s for s in workflow_steps if s["status"] == "pending"])
+    completed_steps = status_counts[StepStatus.COMPLETED]
+    failed_steps = status_counts[StepStatus.FAILED]
+    running_steps = status_counts[StepStatus.RUNNING]
+    pending_steps = status_counts[StepStatus.PENDING]
     
     workflow_stats = {
         "total_steps": len(workflow_steps),
@@ -1550,22 +1915,64 @@ async def get_workflow_steps(campaign_id: str, current_user: User = Depends(get_
     }
     
     return {
-        "campaign_id": campaign_id,
         "workflow_steps": workflow_steps,
         "workflow_stats": workflow_stats,
-        "current_status": current_status,
-        "last_update": datetime.now().isoformat()
+        "current_status": current_status
     }
 
 
+@app.get("/api/v1/campaigns/{campaign_id}/workflow-steps", response_model=WorkflowProgress)
+async def get_workflow_steps(campaign_id: str, request: Request, current_user: User = Depends(get_current_active_user)):
+    """Get detailed information about all workflow steps and their status"""
+    result = await _get_campaign_record(campaign_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    
+    # Check if user owns the campaign or is admin
+    if result.get("created_by") != current_user.username and current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Access denied. You can only view your own campaigns.")
+    
+    # Campaign runs (or ran) on another worker: serve the already-serialized steps it mirrors to Redis
+    if campaign_id not in campaign_results:
+        raw = await _get_mirrored_workflow_steps(campaign_id)
+        if raw is None:
+            # Not mirrored yet, e.g. the campaign is still queued on its worker
+            return ORJSONResponse(status_code=202, content={
+                "campaign_id": campaign_id,
+                "current_status": result.get("status", "unknown"),
+                "detail": "Workflow steps are not available yet"
+            }, headers={"Cache-Control": "no-cache"})
+        return Response(content=raw, media_type="application/json", headers=_campaign_cache_headers(result.get("status")))
+    
+    version = campaign_versions.get(campaign_id, 0)
+    
+    # The state version identifies the payload, so unchanged polls can be answered with a 304
+    headers = {
+        "ETag": f'W/"{campaign_id}-{version}"',
+        # Completed campaigns can't change
+        **_campaign_cache_headers(result.get("status"))
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    payload = _workflow_steps_payload(campaign_id, version)
+    
+    # Payload already matches WorkflowProgress and holds only plain dicts/strings/numbers, so hand it
+    # straight to orjson (datetime serialized natively) instead of re-validating it per poll
+    return ORJSONResponse(content={
+        "campaign_id": campaign_id,
+        **payload,
+        "last_update": datetime.now()
+    }, headers=headers)
+
+
 @app.get("/api/v1/campaigns/{campaign_id}/aws")
 async def get_campaign_aws_info(campaign_id: str, current_user: User = Depends(get_current_active_user)):
     """Get campaign information from AWS S3 and DynamoDB (authentication required)"""
-    if campaign_id not in campaign_results:
+    result = campaign_results.get(campaign_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
-    result = campaign_results.get(campaign_id, {})
-    
     # Check if user owns the campaign or is admin
     if result.get("created_by") != current_user.username and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied. You can only view your own campaigns.")
@@ -1664,11 +2071,10 @@ async def get_aws_campaign_stats(current_user: User = Depends(get_current_admin_
 @app.delete("/api/v1/campaigns/{campaign_id}/aws")
 async def delete_campaign_from_aws(campaign_id: str, current_user: User = Depends(get_current_active_user)):
     """Delete campaign from AWS S3 and DynamoDB (authentication required)"""
-    if campaign_id not in campaign_results:
+    result = campaign_results.get(campaign_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
-    result = campaign_results.get(campaign_id, {})
-    
     # Check if user owns the campaign or is admin
     if result.get("created_by") != current_user.username and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied. You can only delete your own campaigns.")
@@ -1698,17 +2104,24 @@ async def delete_campaign_from_aws(campaign_id: str, current_user: User = Depend
     }
 
 
+async def _iter_file_chunks(path: str, chunk_size: int = 65536):
+    """Yield a file's bytes in chunks without blocking the event loop (64KB matches page-cache readahead)"""
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
+
+
 @app.get("/campaigns/view/{campaign_id}", response_class=HTMLResponse)
 async def view_campaign_website(
-    campaign_id: str
+    campaign_id: str,
+    request: Request
 ):
     """View the generated campaign website in the browser (public by default)"""
 
-    if campaign_id not in campaign_results:
+    result = await _get_campaign_record(campaign_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    result = campaign_results[campaign_id]
-
     # Default to public view unless explicitly set otherwise
     # is_public = result.get("is_public", True)
     # saved_share_token = result.get("share_token")
@@ -1725,32 +2138,55 @@ async def view_campaign_website(
     #         raise HTTPException(status_code=403, detail="Access denied")
 
     if result["status"] != "completed":
+        # The website file is written in one go once the workflow finishes, while the campaign is still
+        # running (S3/DynamoDB persistence comes next), so serve it as soon as it's there
+        partial_path = _latest_website_file(campaign_id) if result["status"] == "running" else None
+        if partial_path:
+            return StreamingResponse(
+                _iter_file_chunks(partial_path),
+                media_type="text/html",
+                headers={"Cache-Control": "no-cache"}
+            )
         return HTMLResponse(content="Campaign generation not completed stay tuned")
         # raise HTTPException(status_code=400, detail="Campaign generation not completed")
 
     # Locate HTML file
-    outputs_dir = "outputs"
-    website_files = [f for f in os.listdir(outputs_dir) if f.endswith("_campaign_website.html")]
-    campaign_files = [f for f in website_files if campaign_id in f]
-
-    if not campaign_files:
+    file_path = _latest_website_file(campaign_id)
+    if not file_path:
         raise HTTPException(status_code=404, detail="Website file not found")
 
-    latest_file = sorted(campaign_files)[-1]
-    file_path = os.path.join(outputs_dir, latest_file)
-
-    # Return HTML directly
-    with open(file_path, "r", encoding="utf-8") as f:
-        html_content = f.read()
+    # A completed campaign's file never changes, so let browsers and proxies revalidate cheaply
+    stat_result = os.stat(file_path)
+    etag = f'W/"{stat_result.st_mtime_ns}-{stat_result.st_size}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600, immutable"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    # Behind nginx, only resolve the path here and let nginx sendfile the bytes
+    if X_ACCEL_REDIRECT_PREFIX:
+        headers["X-Accel-Redirect"] = X_ACCEL_REDIRECT_PREFIX + os.path.basename(file_path)
+        return Response(media_type="text/html", headers=headers)
 
-    return HTMLResponse(content=html_content)
+    # Stream the file from disk rather than reading it into memory on the event loop
+    return FileResponse(
+        path=file_path,
+        media_type="text/html",
+        headers=headers
+    )
 
 
 if __name__ == "__main__":
+    # ENV=production drops auto-reload for worker processes on uvloop/httptools without access logging.
+    # Campaign state is held in process memory, so keep WORKERS=1 unless that state is shared externally.
+    is_dev = os.getenv("ENV", "development").lower() != "production"
     uvicorn.run(
         "api.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=is_dev,
+        workers=1 if is_dev else int(os.getenv("WORKERS", "1")),
+        loop="auto" if is_dev else "uvloop",
+        http="auto" if is_dev else "httptools",
+        access_log=is_dev,
         log_level="info"
     ) 
\ No newline at end of file
@@ -8,6 +8,7 @@ for the Multi-Agent Campaign Generation API.
 
 import os
 import sys
+import argparse
 import subprocess
 import importlib.util
 from pathlib import Path
@@ -15,6 +16,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+STARTUP_MARKER = Path(".startup_ok")
+REQUIREMENTS_FILES = (Path("requirements.txt"), Path("api/requirements.txt"))
+
 
 def check_python_version():
     """Check if Python version is compatible"""
@@ -26,7 +30,7 @@ def check_python_version():
 
 def check_dependencies():
     """Check if required dependencies are installed"""
-    required_packages = [
+    required_packages = (
         "fastapi",
         "uvicorn",
         "pydantic",
@@ -34,16 +38,15 @@ def check_dependencies():
         "langchain_openai",
         "langgraph",
         "openai",
-       
-    ]
+    )
     
     missing_packages = []
     
     for package in required_packages:
-        try:
-            importlib.import_module(package.replace("-", "_"))
+        # find_spec only locates the package; it doesn't execute its (often heavy) import graph
+        if importlib.util.find_spec(package.replace("-", "_")) is not None:
             print(f"✅ {package}")
-        except ImportError:
+        else:
             missing_packages.append(package)
             print(f"❌ {package} - MISSING")
     
@@ -55,6 +58,18 @@ def check_dependencies():
     return True
 
 
+def startup_checks_current() -> bool:
+    """Return True if a previous run's checks passed after the requirements last changed"""
+    if not STARTUP_MARKER.exists():
+        return False
+    marker_mtime = STARTUP_MARKER.stat().st_mtime
+    return all(
+        marker_mtime > requirements.stat().st_mtime
+        for requirements in REQUIREMENTS_FILES
+        if requirements.exists()
+    )
+
+
 def check_environment():
     """Check if environment variables are set"""
     env_file = Path(".env")
@@ -93,12 +108,19 @@ def start_server():
     
     try:
         import uvicorn
-        # Use import string so reload works reliably
+        # Development reloads on code changes; ENV=production runs WORKERS processes on uvloop/httptools
+        # (campaign state is in-process, so more than one worker needs that state shared externally)
+        is_dev = os.getenv("ENV", "development").lower() != "production"
+        # Use import string so reload and workers work reliably
         uvicorn.run(
             "api.main:app",
             host="0.0.0.0",
             port=8000,
-            reload=True,
+            reload=is_dev,
+            workers=1 if is_dev else int(os.getenv("WORKERS", "1")),
+            loop="auto" if is_dev else "uvloop",
+            http="auto" if is_dev else "httptools",
+            access_log=is_dev,
             log_level="info"
         )
     except KeyboardInterrupt:
@@ -111,17 +133,26 @@ def start_server():
 
 def main():
     """Main startup function"""
+    parser = argparse.ArgumentParser(description="Start the Campaign Generation API server")
+    parser.add_argument("--force", action="store_true", help="Re-run dependency checks even if they passed before")
+    args = parser.parse_args()
+    
     print("🎨 Multi-Agent Campaign Generation API")
     print("=" * 50)
     
-    # Check Python version
-    check_python_version()
-    
-    # Check dependencies
-    print("\n🔍 Checking dependencies...")
-    if not check_dependencies():
-        print("\n❌ Please install missing dependencies and try again")
-        sys.exit(1)
+    if not args.force and startup_checks_current():
+        print("\n✅ Python and dependency checks passed previously (use --force to re-run)")
+    else:
+        # Check Python version
+        check_python_version()
+        
+        # Check dependencies
+        print("\n🔍 Checking dependencies...")
+        if not check_dependencies():
+            print("\n❌ Please install missing dependencies and try again")
+            sys.exit(1)
+        
+        STARTUP_MARKER.touch()
     
     # Check environment
     print("\n🔍 Checking environment...")
@@ -10,12 +10,19 @@ import requests
 import time
 import json
 from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+
+
+# One keep-alive session for the whole run, so every test reuses pooled connections
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
 
 def test_health_check(base_url: str = "http://localhost:8000") -> bool:
     """Test the health check endpoint"""
     try:
-        response = requests.get(f"{base_url}/api/v1/health")
+        response = session.get(f"{base_url}/api/v1/health")
         if response.status_code == 200:
             data = response.json()
             print("✅ Health check passed")
@@ -46,7 +53,7 @@ def test_authentication(base_url: str = "http://localhost:8000") -> str:
             "password": "password123"
         }
         
-        response = requests.post(
+        response = session.post(
             f"{base_url}/api/v1/auth/login",
             data=login_data
         )
@@ -81,7 +88,7 @@ def test_user_registration(base_url: str = "http://localhost:8000") -> bool:
             "role": "user"
         }
         
-        response = requests.post(
+        response = session.post(
             f"{base_url}/api/v1/auth/register",
             json=user_data
         )
@@ -124,7 +131,7 @@ def test_campaign_generation(base_url: str = "http://localhost:8000", access_tok
         print("🚀 Testing campaign generation...")
         
         headers = {"Authorization": f"Bearer {access_token}"}
-        response = requests.post(
+        response = session.post(
             f"{base_url}/api/v1/campaigns/generate",
             json=campaign_brief,
             headers=headers
@@ -156,7 +163,7 @@ def test_campaign_status(base_url: str, campaign_id: str, access_token: str = No
     
     try:
         headers = {"Authorization": f"Bearer {access_token}"}
-        response = requests.get(
+        response = session.get(
             f"{base_url}/api/v1/campaigns/{campaign_id}/status",
             headers=headers
         )
@@ -187,7 +194,7 @@ def test_list_campaigns(base_url: str = "http://localhost:8000", access_token: s
     
     try:
         headers = {"Authorization": f"Bearer {access_token}"}
-        response = requests.get(
+        response = session.get(
             f"{base_url}/api/v1/campaigns",
             headers=headers
         )
@@ -215,7 +222,7 @@ def test_unauthorized_access(base_url: str = "http://localhost:8000") -> bool:
         print("🚫 Testing unauthorized access...")
         
         # Try to access protected endpoint without token
-        response = requests.post(
+        response = session.post(
             f"{base_url}/api/v1/campaigns/generate",
             json={"product": "test"}
         )
@@ -11,7 +11,9 @@ Usage:
 Make sure to set up your .env file with the required API keys before running.
 """
 
+import os
 import time
+import logging
 import traceback
 from langgraph.checkpoint.memory import MemorySaver
 
@@ -125,4 +127,6 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     main() 
\ No newline at end of file
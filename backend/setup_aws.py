@@ -8,10 +8,14 @@ for the campaign generation system.
 
 import os
 import sys
-from dotenv import load_dotenv
+import importlib.util
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (python-dotenv is only needed when there is a .env file to read).
+# The marker variable is inherited by reimports and child processes, so .env is parsed once.
+if not os.environ.get('_DOTENV_LOADED') and os.path.exists('.env'):
+    from dotenv import load_dotenv
+    load_dotenv()
+    os.environ['_DOTENV_LOADED'] = '1'
 
 def check_aws_credentials():
     """Check if AWS credentials are configured"""
@@ -120,17 +124,15 @@ MAX_WORKFLOW_DURATION=300
         return False
 
 def install_dependencies():
-    """Install required dependencies"""
-    print("\n📦 Installing dependencies...")
+    """Check that the AWS dependencies are installed"""
+    print("\n📦 Checking dependencies...")
     
-    try:
-        import boto3
-        print("  ✅ boto3 already installed")
-    except ImportError:
-        print("  Installing boto3...")
-        os.system("pip install boto3 botocore python-dotenv")
-        print("  ✅ Dependencies installed")
+    # find_spec checks for boto3 without paying its import cost; the services import it when tested.
+    # Installing is left to the user so this script never resolves packages into the running Python.
+    if importlib.util.find_spec("boto3") is None:
+        raise SystemExit("❌ boto3 missing — run: pip install -r requirements.txt")
     
+    print("  ✅ boto3 already installed")
     return True
 
 def main():
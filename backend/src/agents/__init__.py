@@ -5,7 +5,7 @@ This module contains all the specialized agent classes used in the campaign gene
 """
 
 from .base_agent import BaseAgent, WorkflowErrorTracker
-from .content_agents import ProjectManager, StrategyTeam, CreativeTeam, CopyTeam, VisualTeam
+from .content_agents import ProjectManager, StrategyTeam, CreativeTeam, CopyTeam, VisualTeam, FusedContentAgent
 from .design_agents import DesignerTeam, HTMLValidationAgent
 from .analysis_agents import ReviewTeam, CampaignSummaryAgent, CTAOptimizer, AudiencePersonaAgent
 from .output_agents import WebDeveloper, PDFGeneratorTeam
@@ -22,6 +22,7 @@ __all__ = [
     "CreativeTeam",
     "CopyTeam",
     "VisualTeam",
+    "FusedContentAgent",
     
     # Design and validation agents
     "DesignerTeam",
@@ -5,9 +5,28 @@ This module contains agents responsible for reviewing content, optimizing campai
 and providing analytical insights.
 """
 
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, prompt_template, render_prompt
 from ..utils.state import State
 
+CAMPAIGN_SUMMARY_PROMPT_TEMPLATE = prompt_template("""
+    Create a structured summary of the campaign. Include:
+
+    1. A headline title for the campaign
+    2. A one-paragraph summary
+    3. A sectioned breakdown:
+      - Strategy
+      - Creative Concepts
+      - Copy Highlights
+      - Key Feedback Points
+    4. Visual Asset URL: {image_url}
+
+    Here is the data:
+    Strategy: {strategy}
+    Creative Concepts: {creative_concepts}
+    Copy: {copy}
+    Feedback: {feedback}
+""")
+
 
 class ReviewTeam(BaseAgent):
     """
@@ -20,6 +39,8 @@ class ReviewTeam(BaseAgent):
     - Strategic alignment verification
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the review team responsible for evaluating the campaign.
@@ -46,6 +67,8 @@ class CampaignSummaryAgent(BaseAgent):
     - Structured presentation of campaign data
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the campaign summarizer. Your job is to take all campaign elements
@@ -55,30 +78,13 @@ class CampaignSummaryAgent(BaseAgent):
         )
 
     def run(self, state: State) -> dict:
-        strategy = state["artifacts"].get("strategy", "")
-        concepts = state["artifacts"].get("creative_concepts", "")
-        copy = state["artifacts"].get("copy", "")
+        artifacts = state["artifacts"]
         feedback = state.get("feedback", [])
-        image_url = state["artifacts"].get("visual", {}).get("image_url", "")
-
-        prompt = f"""
-            Create a structured summary of the campaign. Include:
-
-            1. A headline title for the campaign
-            2. A one-paragraph summary
-            3. A sectioned breakdown:
-              - Strategy
-              - Creative Concepts
-              - Copy Highlights
-              - Key Feedback Points
-            4. Visual Asset URL: {image_url}
-
-            Here is the data:
-            Strategy: {strategy}
-            Creative Concepts: {concepts}
-            Copy: {copy}
-            Feedback: {" | ".join([msg.content if hasattr(msg, "content") else str(msg) for msg in feedback])}
-            """
+        prompt = render_prompt(
+            CAMPAIGN_SUMMARY_PROMPT_TEMPLATE, artifacts,
+            image_url=artifacts.get("visual", {}).get("image_url", ""),
+            feedback=" | ".join([msg.content if hasattr(msg, "content") else str(msg) for msg in feedback])
+        )
 
         messages = self.get_messages(prompt)
         response = self.invoke_llm_with_retry(messages, "Campaign Summary Generation")
@@ -96,6 +102,8 @@ class CTAOptimizer(BaseAgent):
     - A/B testing suggestions for CTAs
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the CTA (Call-to-Action) optimization specialist.
@@ -129,6 +137,8 @@ class AudiencePersonaAgent(BaseAgent):
     - Communication preference mapping
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the audience persona specialist.
@@ -5,29 +5,45 @@ This module contains the foundational classes for all agents in the multi-agent
 including error handling, retry logic, and circuit breaker patterns.
 """
 
+import os
 import time
 import json
-from typing import List
+import logging
+import random
+import asyncio
+import textwrap
+import threading
+from functools import lru_cache
+from typing import List, Optional
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from langchain_openai import ChatOpenAI
 from ..utils.state import State
 
+logger = logging.getLogger(__name__)
+
 
 # Global error tracking for circuit breaker pattern
 class WorkflowErrorTracker:
-    """Circuit breaker pattern implementation for API failure tracking"""
+    """Circuit breaker pattern implementation for API failure tracking (safe to share across agent threads)"""
+    
+    __slots__ = ("failures", "max_failures", "circuit_open", "_lock")
     
     def __init__(self, max_failures=5):
         self.failures = 0
         self.max_failures = max_failures
         self.circuit_open = False
+        self._lock = threading.RLock()
     
     def record_failure(self):
         """Record an API failure and check if circuit should open"""
-        self.failures += 1
-        if self.failures >= self.max_failures:
-            self.circuit_open = True
-            print(f"🚨 CIRCUIT BREAKER ACTIVATED: Too many API failures ({self.failures})")
+        with self._lock:
+            self.failures += 1
+            failures = self.failures
+            just_opened = failures >= self.max_failures and not self.circuit_open
+            if failures >= self.max_failures:
+                self.circuit_open = True
+        if just_opened:
+            print(f"🚨 CIRCUIT BREAKER ACTIVATED: Too many API failures ({failures})")
             print("🔧 Recommendations:")
             print("   1. Check your API keys and configuration")
             print("   2. Verify internet connectivity")
@@ -36,19 +52,148 @@ class WorkflowErrorTracker:
     
     def record_success(self):
         """Record successful API call and reset circuit if needed"""
-        if self.failures > 0:
-            print(f"✅ API recovered after {self.failures} failures")
-        self.failures = 0
-        self.circuit_open = False
+        with self._lock:
+            failures = self.failures
+            self.failures = 0
+            self.circuit_open = False
+        if failures > 0:
+            print(f"✅ API recovered after {failures} failures")
     
     def is_circuit_open(self):
         """Check if circuit breaker is currently open"""
-        return self.circuit_open
+        with self._lock:
+            return self.circuit_open
+
+
+_FALLBACK_TEMPLATE = """
+FALLBACK RESPONSE - API Service Unavailable
+
+Agent: {agent}
+Context: {context}
+Error: {error}
+
+This is a generated fallback response due to API connectivity issues.
+The workflow will continue with basic placeholder content.
+
+RECOMMENDATIONS:
+1. Check API key configuration in .env file
+2. Verify OpenRouter service status
+3. Check internet connectivity
+4. Consider rate limiting or quota exhaustion
+5. Try switching to a different model
+
+The campaign generation will continue with available data.
+Please manually review and enhance this section when API service is restored.
+"""
+
+
+@lru_cache(maxsize=128)
+def _fallback_content(agent: str, context: str, error: str) -> str:
+    """Format the fallback text once per distinct failure (a circuit-open storm repeats the same ones)"""
+    return _FALLBACK_TEMPLATE.format(agent=agent, context=context, error=error)
+
+
+class StreamInterruptedError(Exception):
+    """Raised when a streamed LLM response fails after output has started"""
 
 
 # Global error tracker instance
 error_tracker = WorkflowErrorTracker()
 
+# Set on shutdown to cut short any retry backoff still waiting on a worker thread
+shutdown_event = threading.Event()
+
+# Receives (campaign_id, artifact_name, text_so_far) while long artifacts stream in
+_partial_artifact_sink = None
+PARTIAL_ARTIFACT_FLUSH_CHARS = 2000  # roughly 500 tokens
+
+
+def set_partial_artifact_sink(sink):
+    """Register the callback that publishes partial artifacts, e.g. to the API's live campaign record"""
+    global _partial_artifact_sink
+    _partial_artifact_sink = sink
+
+
+def campaign_id_from_config(config) -> Optional[str]:
+    """The campaign a workflow run belongs to; the API runs each campaign with its id as thread_id"""
+    config = config or {}
+    return (config.get("configurable") or {}).get("thread_id") or config.get("thread_id")
+
+
+# OpenRouter model families that honour cache_control breakpoints
+PROMPT_CACHING_MODEL_PREFIXES = ("anthropic/", "google/gemini")
+
+
+def prompt_caching_enabled() -> bool:
+    """
+    Whether to mark static prompt blocks with cache_control breakpoints.
+    
+    Breakpoints turn system and context messages into lists of typed content parts, which only
+    Anthropic and Gemini models use (and some other providers reject). So by default they are only
+    sent to those models through OpenRouter; LLM_PROMPT_CACHING overrides the choice either way.
+    """
+    setting = os.getenv("LLM_PROMPT_CACHING")
+    if setting is not None:
+        return setting.lower() in ("1", "true", "yes")
+    if "openrouter" not in os.getenv("OPENROUTER_BASE_URL", ""):
+        return False
+    model = os.getenv("RATIONAL_MODEL", "google/gemini-2.5-flash-lite").lower()
+    return model.startswith(PROMPT_CACHING_MODEL_PREFIXES)
+
+
+def cacheable_content(text: str):
+    """Message content for a static prompt block, marked as a prompt-cache breakpoint when enabled"""
+    if not prompt_caching_enabled():
+        return text
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+SHARED_CONTEXT_ARTIFACTS = (
+    ("Strategy", "strategy"),
+    ("Audience Personas", "audience_personas"),
+    ("Creative Concepts", "creative_concepts"),
+    ("Copy Content", "copy"),
+    ("CTA Optimization", "cta_optimization"),
+)
+
+
+def build_shared_context(state: State) -> str:
+    """
+    Format the campaign brief and core artifacts once, for every agent that reads them.
+    
+    Workflow nodes that run several agents store the result under state["shared_context"]
+    so the text is built (and sent as an identical, cacheable block) only once.
+    """
+    artifacts = state.get("artifacts", {})
+    sections = [f"Campaign Brief: {state['campaign_brief']}"]
+    sections.extend(f"{label}: {artifacts.get(key, '')}" for label, key in SHARED_CONTEXT_ARTIFACTS)
+    return "\n\n".join(sections)
+
+
+class _PromptValues(dict):
+    """format_map mapping that renders missing artifacts as empty strings"""
+    __slots__ = ()
+    
+    def __missing__(self, key):
+        return ""
+
+
+def prompt_template(text: str) -> str:
+    """Dedent a prompt template once, when the module defining it is imported"""
+    return textwrap.dedent(text).strip()
+
+
+def render_prompt(template: str, artifacts: dict, **values) -> str:
+    """
+    Fill a prompt template in one pass from the artifacts plus any extra values.
+    
+    Args:
+        template: Template built with prompt_template, using {artifact_name} placeholders
+        artifacts: Campaign artifacts; missing ones render as empty strings
+        **values: Additional or overriding placeholder values
+    """
+    return template.format_map(_PromptValues(artifacts, **values))
+
 
 class BaseAgent:
     """
@@ -61,108 +206,236 @@ class BaseAgent:
     - State management utilities
     """
     
+    __slots__ = ("system_prompt", "_system_message", "llm", "max_retries", "retry_delay")
+    
     def __init__(self, system_prompt: str, llm: ChatOpenAI = None):
         self.system_prompt = system_prompt
+        # Built once and reused for every call; always first so the provider can cache it as a prefix
+        self._system_message = SystemMessage(content=cacheable_content(system_prompt))
         self.llm = llm
         self.max_retries = 2
         self.retry_delay = 2  # seconds
     
-    def get_messages(self, content: str) -> List:
-        """Create message list for LLM with system prompt and user content"""
+    def get_messages(self, content: str, shared_context: str = None) -> List:
+        """
+        Create message list for LLM with system prompt and user content
+        
+        When given, shared_context goes between the two as its own cacheable block, so the
+        static parts of the prompt come first and only the task question varies.
+        """
+        if shared_context is None:
+            return [
+                self._system_message,
+                HumanMessage(content=content)
+            ]
         return [
-            SystemMessage(content=self.system_prompt),
+            self._system_message,
+            HumanMessage(content=cacheable_content(shared_context)),
             HumanMessage(content=content)
         ]
     
-    def invoke_llm_with_retry(self, messages, context=""):
+    @staticmethod
+    def shared_context(state: State) -> str:
+        """The shared campaign context for this state, reusing one built by the workflow node"""
+        return state.get("shared_context") or build_shared_context(state)
+    
+    def invoke_llm_with_retry(self, messages, context="", on_chunk=None, on_restart=None):
         """
         Invoke LLM with retry logic, error handling, and circuit breaker
         
         Args:
             messages: List of messages to send to LLM
             context: Context description for error logging
+            on_chunk: Optional callback that receives the response text as it streams in
+            on_restart: Optional callback run before a stream that broke off is retried from
+                the start, so on_chunk's consumer can discard the partial output it has seen
             
         Returns:
             AIMessage: Response from LLM or fallback response
         """
         # Check circuit breaker
         if error_tracker.is_circuit_open():
-            print(f"⚠️ Circuit breaker is open. Generating fallback response for {context}")
+            logger.warning("Circuit breaker is open. Generating fallback response for %s", context)
             return self.generate_fallback_response(context, "Circuit breaker activated")
         
+        # Backoff is per call so a failure never inflates the delay of later calls
+        delay = self.retry_delay
+        
         for attempt in range(self.max_retries):
             try:
-                print(f"🔄 Attempting API call for {context} (attempt {attempt + 1}/{self.max_retries})...")
-                response = self.llm.invoke(messages)
-                print(f"✅ API call successful for {context}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Attempting API call for %s (attempt %d/%d)", context, attempt + 1, self.max_retries)
+                if on_chunk is not None:
+                    response = self._stream_llm(messages, on_chunk, context)
+                else:
+                    response = self.llm.invoke(messages)
+                logger.debug("API call successful for %s", context)
                 error_tracker.record_success()
                 return response
                 
+            except StreamInterruptedError as e:
+                logger.error("Stream interrupted on attempt %d for %s: %s", attempt + 1, context, e)
+                error_tracker.record_failure()
+                
+                if attempt < self.max_retries - 1 and not error_tracker.is_circuit_open():
+                    wait = random.uniform(delay * 0.5, delay * 1.5)
+                    logger.info("Waiting %.1f seconds before restarting the stream...", wait)
+                    if shutdown_event.wait(wait):
+                        return self.generate_fallback_response(context, "Shutting down")
+                    delay *= 2
+                    # The consumer has seen partial output; let it start over with the new stream
+                    if on_restart is not None:
+                        on_restart()
+                else:
+                    logger.error("All API attempts failed for %s. Generating fallback response", context)
+                    return self.generate_fallback_response(context, f"Stream interrupted: {str(e)}")
+                
             except json.JSONDecodeError as e:
-                print(f"❌ JSONDecodeError on attempt {attempt + 1} for {context}: {str(e)}")
+                logger.error("JSONDecodeError on attempt %d for %s: %s", attempt + 1, context, e)
                 error_tracker.record_failure()
                 
                 if attempt < self.max_retries - 1 and not error_tracker.is_circuit_open():
-                    print(f"⏳ Waiting {self.retry_delay} seconds before retry...")
-                    time.sleep(self.retry_delay)
-                    self.retry_delay *= 2  # Exponential backoff
+                    wait = random.uniform(delay * 0.5, delay * 1.5)  # Jitter spreads out retries from parallel agents
+                    logger.info("Waiting %.1f seconds before retry...", wait)
+                    if shutdown_event.wait(wait):
+                        return self.generate_fallback_response(context, "Shutting down")
+                    delay *= 2  # Exponential backoff
                 else:
-                    print(f"❌ All API attempts failed for {context}. Generating fallback response")
+                    logger.error("All API attempts failed for %s. Generating fallback response", context)
                     return self.generate_fallback_response(context, f"JSONDecodeError: {str(e)}")
                     
             except Exception as e:
-                print(f"❌ API Error on attempt {attempt + 1} for {context}: {str(e)}")
+                logger.error("API Error on attempt %d for %s: %s", attempt + 1, context, e)
                 error_tracker.record_failure()
                 
                 if attempt < self.max_retries - 1 and not error_tracker.is_circuit_open():
-                    print(f"⏳ Waiting {self.retry_delay} seconds before retry...")
-                    time.sleep(self.retry_delay)
-                    self.retry_delay *= 2
+                    wait = random.uniform(delay * 0.5, delay * 1.5)  # Jitter spreads out retries from parallel agents
+                    logger.info("Waiting %.1f seconds before retry...", wait)
+                    if shutdown_event.wait(wait):
+                        return self.generate_fallback_response(context, "Shutting down")
+                    delay *= 2  # Exponential backoff
                 else:
-                    print(f"❌ All API attempts failed for {context}. Generating fallback response")
+                    logger.error("All API attempts failed for %s. Generating fallback response", context)
                     return self.generate_fallback_response(context, f"API Error: {str(e)}")
         
         return self.generate_fallback_response(context, "Max retries exceeded")
     
-    def generate_fallback_response(self, context="", error_details=""):
+    def invoke_llm_publishing_partials(self, messages, context, artifact_name, campaign_id=None):
         """
-        Generate a fallback response when API calls fail
+        Invoke the LLM, publishing the artifact text to the partial-artifact sink as it streams in.
+        
+        Falls back to a plain call when no sink is registered or the run has no campaign id.
+        """
+        sink = _partial_artifact_sink
+        if sink is None or campaign_id is None:
+            return self.invoke_llm_with_retry(messages, context)
+        
+        parts = []
+        unpublished = 0
+        
+        def publish(text):
+            nonlocal unpublished
+            parts.append(text)
+            unpublished += len(text)
+            if unpublished < PARTIAL_ARTIFACT_FLUSH_CHARS:
+                return
+            unpublished = 0
+            try:
+                sink(campaign_id, artifact_name, "".join(parts))
+            except Exception as e:
+                # A failed publish must not abort the stream itself
+                logger.warning("Failed to publish partial %s: %s", artifact_name, e)
+        
+        def restart():
+            nonlocal unpublished
+            parts.clear()
+            unpublished = 0
+        
+        return self.invoke_llm_with_retry(messages, context, on_chunk=publish, on_restart=restart)
+    
+    def _stream_llm(self, messages, on_chunk, context=""):
+        """
+        Stream a completion, passing each piece of text to on_chunk as it arrives
+        
+        Errors before the first chunk propagate so the caller can retry; once output has
+        started (and been handed to on_chunk), a failure raises StreamInterruptedError.
+        """
+        parts = []
+        try:
+            for chunk in self.llm.stream(messages):
+                if chunk.content:
+                    parts.append(chunk.content)
+                    on_chunk(chunk.content)
+        except Exception as e:
+            if not parts:
+                raise
+            raise StreamInterruptedError(f"after {len(parts)} chunks: {str(e)}") from e
+        return AIMessage(content="".join(parts))
+    
+    async def ainvoke_llm_with_retry(self, messages, context=""):
+        """
+        Async version of invoke_llm_with_retry that backs off without blocking the event loop
         
         Args:
-            context: Description of the operation context
-            error_details: Specific error information
+            messages: List of messages to send to LLM
+            context: Context description for error logging
             
         Returns:
-            AIMessage: Fallback response with error information
+            AIMessage: Response from LLM or fallback response
         """
-        fallback_content = f"""
-        FALLBACK RESPONSE - API Service Unavailable
-        
-        Agent: {self.__class__.__name__}
-        Context: {context}
-        Error: {error_details}
+        if error_tracker.is_circuit_open():
+            logger.warning("Circuit breaker is open. Generating fallback response for %s", context)
+            return self.generate_fallback_response(context, "Circuit breaker activated")
         
-        This is a generated fallback response due to API connectivity issues.
-        The workflow will continue with basic placeholder content.
+        delay = self.retry_delay
         
-        RECOMMENDATIONS:
-        1. Check API key configuration in .env file
-        2. Verify OpenRouter service status
-        3. Check internet connectivity
-        4. Consider rate limiting or quota exhaustion
-        5. Try switching to a different model
+        for attempt in range(self.max_retries):
+            try:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Attempting API call for %s (attempt %d/%d)", context, attempt + 1, self.max_retries)
+                response = await self.llm.ainvoke(messages)
+                logger.debug("API call successful for %s", context)
+                error_tracker.record_success()
+                return response
+                
+            except Exception as e:
+                error_type = "JSONDecodeError" if isinstance(e, json.JSONDecodeError) else "API Error"
+                logger.error("%s on attempt %d for %s: %s", error_type, attempt + 1, context, e)
+                error_tracker.record_failure()
+                
+                if attempt < self.max_retries - 1 and not error_tracker.is_circuit_open():
+                    wait = random.uniform(delay * 0.5, delay * 1.5)
+                    logger.info("Waiting %.1f seconds before retry...", wait)
+                    await asyncio.sleep(wait)
+                    delay *= 2
+                else:
+                    logger.error("All API attempts failed for %s. Generating fallback response", context)
+                    return self.generate_fallback_response(context, f"{error_type}: {str(e)}")
         
-        The campaign generation will continue with available data.
-        Please manually review and enhance this section when API service is restored.
+        return self.generate_fallback_response(context, "Max retries exceeded")
+    
+    def generate_fallback_response(self, context="", error_details=""):
         """
+        Generate a fallback response when API calls fail
         
-        return AIMessage(content=fallback_content)
+        Args:
+            context: Description of the operation context
+            error_details: Specific error information
+            
+        Returns:
+            AIMessage: Fallback response with error information
+        """
+        # A new message each time: LangGraph assigns ids to messages, so they must not be shared
+        return AIMessage(content=_fallback_content(type(self).__name__, str(context), str(error_details)))
     
     @staticmethod
     def return_state(state: State, response, new_artifacts: dict = None, feedback: list = None) -> dict:
         """
         Create new state with updated artifacts and messages
         
+        Only the new artifacts and feedback are returned; the State's reducers merge them
+        into the existing ones, so no agent rebuilds the whole artifacts dict or feedback list.
+        
         Args:
             state: Current workflow state
             response: LLM response or message
@@ -172,23 +445,65 @@ class BaseAgent:
         Returns:
             dict: Updated state dictionary
         """
+        state_get = state.get
+        workflow_start_time = state_get("workflow_start_time")
         return {
             "messages": [response] if response else [],
-            "artifacts": {
-                **state.get("artifacts", {}),
-                **(new_artifacts or {})
-            },
-            "feedback": [*state.get("feedback", []), *(feedback or [])],
-            "revision_count": state.get("revision_count", 0),
+            "artifacts": new_artifacts or {},
+            "feedback": feedback or [],
+            "revision_count": state_get("revision_count", 0),
             "campaign_brief": state["campaign_brief"],
-            "previous_artifacts": state.get("previous_artifacts", {}),
-            "workflow_start_time": state.get("workflow_start_time", time.time())
+            "previous_artifacts": state_get("previous_artifacts", {}),
+            "workflow_start_time": workflow_start_time if workflow_start_time is not None else time.time()
         }
     
+    def prepare(self, state: State) -> tuple:
+        """
+        Build the LLM request for this agent.
+        
+        Agents that make a single LLM call implement prepare() and finish() instead of run(),
+        which gives them both a sync run() and an async arun() for free.
+        
+        Args:
+            state: Current workflow state
+            
+        Returns:
+            tuple: (messages, context description for logging)
+        """
+        raise NotImplementedError("Each agent must implement the run method or prepare/finish")
+    
+    def finish(self, state: State, response) -> dict:
+        """
+        Turn the LLM response into the agent's state update.
+        
+        Args:
+            state: Current workflow state
+            response: LLM response (or fallback response)
+            
+        Returns:
+            dict: Updated state after agent execution
+        """
+        raise NotImplementedError("Agents that implement prepare must implement finish")
+    
     def run(self, state: State) -> dict:
         """
         Main execution method for the agent.
-        Should be implemented by each specific agent.
+        Should be implemented by each specific agent, or provided via prepare/finish.
+        
+        Args:
+            state: Current workflow state
+            
+        Returns:
+            dict: Updated state after agent execution
+        """
+        messages, context = self.prepare(state)
+        return self.finish(state, self.invoke_llm_with_retry(messages, context))
+    
+    async def arun(self, state: State) -> dict:
+        """
+        Async execution method, awaiting the LLM instead of blocking a thread.
+        
+        Agents that only implement run() are executed on a worker thread instead.
         
         Args:
             state: Current workflow state
@@ -196,4 +511,7 @@ class BaseAgent:
         Returns:
             dict: Updated state after agent execution
         """
-        raise NotImplementedError("Each agent must implement the run method") 
\ No newline at end of file
+        if type(self).prepare is BaseAgent.prepare:
+            return await asyncio.to_thread(self.run, state)
+        messages, context = self.prepare(state)
+        return self.finish(state, await self.ainvoke_llm_with_retry(messages, context)) 
\ No newline at end of file
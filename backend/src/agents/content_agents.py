@@ -5,9 +5,21 @@ This module contains agents responsible for generating the core content of marke
 including strategy, creative concepts, copy, and visual direction.
 """
 
+import json
 from .base_agent import BaseAgent
 from ..utils.state import State
 
+# DALL·E 3 caps prompts at 4000 characters; stay under it with room for an ellipsis
+IMAGE_PROMPT_MAX_CHARS = 3800
+
+
+def truncate_image_prompt(prompt: str, limit: int = IMAGE_PROMPT_MAX_CHARS) -> str:
+    """Cut an image prompt to the character limit at a word boundary"""
+    if len(prompt) <= limit:
+        return prompt
+    cut = prompt.rfind(" ", 0, limit)
+    return prompt[:cut if cut > 0 else limit].rstrip() + "..."
+
 
 class ProjectManager(BaseAgent):
     """
@@ -20,6 +32,8 @@ class ProjectManager(BaseAgent):
     - Team communication and alignment
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are a project manager coordinating an ad campaign creation.
@@ -29,8 +43,22 @@ class ProjectManager(BaseAgent):
             llm=llm
         )
     
+    @staticmethod
+    def summarize_state(state: State) -> str:
+        """Describe the workflow state compactly instead of embedding every artifact in the prompt"""
+        artifacts = {
+            name: value[:200] if isinstance(value, str) else type(value).__name__
+            for name, value in state.get("artifacts", {}).items()
+        }
+        return (
+            f"Campaign brief: {state.get('campaign_brief')}. "
+            f"Artifacts present: {artifacts}. "
+            f"Revision count: {state.get('revision_count', 0)}. "
+            f"Recent feedback: {state.get('feedback', [])[-3:]}"
+        )
+    
     def run(self, state: State) -> dict:
-        messages = self.get_messages(f"Current state: {state}. What should be our next action?")
+        messages = self.get_messages(f"Current state: {self.summarize_state(state)}. What should be our next action?")
         response = self.invoke_llm_with_retry(messages, "Project Management")
         
         # Increment revision_count if feedback exists
@@ -53,6 +81,8 @@ class StrategyTeam(BaseAgent):
     - Goals alignment and success metrics definition
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the strategy team responsible for analyzing campaign requirements.
@@ -78,6 +108,8 @@ class CreativeTeam(BaseAgent):
     - Brand alignment and creative consistency
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the creative team responsible for generating innovative ad concepts.
@@ -104,6 +136,8 @@ class CopyTeam(BaseAgent):
     - Persuasive writing and emotional triggers
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the copywriting team responsible for creating compelling ad copy.
@@ -130,6 +164,8 @@ class VisualTeam(BaseAgent):
     - Technical prompt optimization for AI generation
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the visual design lead for this campaign. 
@@ -139,11 +175,79 @@ class VisualTeam(BaseAgent):
         )
 
     def run(self, state: State) -> dict:
-        copy = state["artifacts"].get("copy", "")
-        concepts = state["artifacts"].get("creative_concepts", "")
+        artifacts = state.get("artifacts", {})
+        copy = artifacts.get("copy", "")
+        concepts = artifacts.get("creative_concepts", "")
         messages = self.get_messages(
             f"Based on this copy: {copy} and concepts: {concepts}, create a detailed image prompt."
         )
         response = self.invoke_llm_with_retry(messages, "Visual Design Direction")
 
-        return self.return_state(state, response, {"visual": {"image_prompt": response.content}}) 
\ No newline at end of file
+        # The model doesn't always respect the length in the prompt; enforce it here rather than
+        # let the image request fail downstream
+        return self.return_state(state, response, {"visual": {"image_prompt": truncate_image_prompt(response.content)}})
+
+
+class FusedContentAgent(BaseAgent):
+    """
+    Fused Content Agent - Produces strategy, concepts, copy and image prompt in one LLM call.
+    
+    Responsibilities:
+    - Strategy, creative, copy and visual direction from a single structured response
+    - Falling back to the individual content teams when the response can't be parsed
+    """
+    
+    __slots__ = ("fallback_agents",)
+    
+    FIELDS = ("strategy", "creative_concepts", "copy", "visual_prompt")
+    
+    def __init__(self, llm):
+        super().__init__(
+            system_prompt="""You are the combined strategy, creative, copywriting and visual design team for an ad campaign.
+            Work through the campaign in order: strategy first, then creative concepts that follow the strategy,
+            then ad copy (headlines, body copy, calls-to-action) for those concepts, then a vivid DALL·E image prompt
+            of no more than 3800 characters for the copy and concepts.
+            Respond with a single JSON object with the string keys "strategy", "creative_concepts", "copy" and "visual_prompt".""",
+            llm=llm.bind(response_format={"type": "json_object"}) if llm else None
+        )
+        # Used when the model doesn't return the expected JSON object
+        self.fallback_agents = (StrategyTeam(llm), CreativeTeam(llm), CopyTeam(llm), VisualTeam(llm))
+    
+    def parse_response(self, content: str):
+        """Return the four content fields as strings, or None if the response is incomplete"""
+        try:
+            data = json.loads(content)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(data, dict) or not all(data.get(field) for field in self.FIELDS):
+            return None
+        return {
+            field: data[field] if isinstance(data[field], str) else json.dumps(data[field], indent=2)
+            for field in self.FIELDS
+        }
+    
+    def run_sequential(self, state: State) -> dict:
+        """Run the individual content teams one after another"""
+        artifacts = {}
+        messages = []
+        for agent in self.fallback_agents:
+            result = agent.run({**state, "artifacts": {**state.get("artifacts", {}), **artifacts}})
+            artifacts.update(result["artifacts"])
+            messages.extend(result["messages"])
+        return {**self.return_state(state, None, artifacts), "messages": messages}
+    
+    def run(self, state: State) -> dict:
+        messages = self.get_messages(f"Create the campaign content for this brief: {state['campaign_brief']}")
+        response = self.invoke_llm_with_retry(messages, "Fused Content Generation")
+        
+        fields = self.parse_response(response.content)
+        if fields is None:
+            print("⚠️ Fused content response was not valid JSON. Running content teams individually")
+            return self.run_sequential(state)
+        
+        return self.return_state(state, response, {
+            "strategy": fields["strategy"],
+            "creative_concepts": fields["creative_concepts"],
+            "copy": fields["copy"],
+            "visual": {"image_prompt": truncate_image_prompt(fields["visual_prompt"])}
+        })
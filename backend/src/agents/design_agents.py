@@ -6,9 +6,36 @@ and technical validation of generated content.
 """
 
 import re
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, prompt_template, render_prompt
+from .content_agents import truncate_image_prompt
 from ..utils.state import State
 
+HTML_VALIDATION_PROMPT_TEMPLATE = prompt_template("""
+    Please validate and correct the following HTML code. Focus on creating valid, accessible, and performant HTML.
+    
+    CRITICAL ISSUES FOUND: {issues}
+    WARNINGS: {warnings}
+    RECOMMENDED FIXES: {fixes}
+    
+    HTML CODE TO VALIDATE AND CORRECT:
+    {html}
+    
+    REQUIREMENTS FOR CORRECTION:
+    1. Fix all critical issues listed above
+    2. Address accessibility warnings (add alt tags, semantic HTML)
+    3. Ensure valid HTML5 structure with proper DOCTYPE
+    4. Include proper meta tags for mobile and SEO
+    5. Ensure all tags are properly closed and nested
+    6. Add semantic HTML elements (header, nav, main, section, footer)
+    7. Include ARIA attributes where appropriate
+    8. Optimize CSS (move inline styles to style blocks)
+    9. Add proper error handling for JavaScript if present
+    10. Ensure mobile responsiveness with proper CSS
+    11. Replac ** for bold and * for italic
+    
+    IMPORTANT: Return ONLY the corrected, complete HTML code without any explanations or markdown formatting.
+""")
+
 
 class DesignerTeam(BaseAgent):
     """
@@ -21,6 +48,8 @@ class DesignerTeam(BaseAgent):
     - Fallback handling for generation failures
     """
     
+    __slots__ = ("openai_client",)
+    
     def __init__(self, llm, openai_client):
         super().__init__(
             system_prompt="""You are the senior designer team responsible for creating the ad design.
@@ -37,8 +66,7 @@ class DesignerTeam(BaseAgent):
             print("[⚠️] No visual prompt found. Skipping image generation.")
             return self.return_state(state, None)
 
-        if len(visual_prompt) > 3800:
-            visual_prompt = visual_prompt[:3800] + "..."
+        visual_prompt = truncate_image_prompt(visual_prompt)
 
         print("[🎨] Generating image from visual prompt...")
 
@@ -97,6 +125,8 @@ class HTMLValidationAgent(BaseAgent):
     - Automatic code correction and improvement
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are an HTML validation and correction specialist.
@@ -338,31 +368,13 @@ class HTMLValidationAgent(BaseAgent):
         validation_report = self.validate_html_css_js_comprehensive(cleaned_html)
         
         # Create validation prompt for AI-based correction
-        validation_prompt = f"""
-        Please validate and correct the following HTML code. Focus on creating valid, accessible, and performant HTML.
-        
-        CRITICAL ISSUES FOUND: {validation_report['all_issues']}
-        WARNINGS: {validation_report['all_warnings']}
-        RECOMMENDED FIXES: {validation_report['all_fixes']}
-        
-        HTML CODE TO VALIDATE AND CORRECT:
-        {cleaned_html}
-        
-        REQUIREMENTS FOR CORRECTION:
-        1. Fix all critical issues listed above
-        2. Address accessibility warnings (add alt tags, semantic HTML)
-        3. Ensure valid HTML5 structure with proper DOCTYPE
-        4. Include proper meta tags for mobile and SEO
-        5. Ensure all tags are properly closed and nested
-        6. Add semantic HTML elements (header, nav, main, section, footer)
-        7. Include ARIA attributes where appropriate
-        8. Optimize CSS (move inline styles to style blocks)
-        9. Add proper error handling for JavaScript if present
-        10. Ensure mobile responsiveness with proper CSS
-        11. Replac ** for bold and * for italic
-        
-        IMPORTANT: Return ONLY the corrected, complete HTML code without any explanations or markdown formatting.
-        """
+        validation_prompt = render_prompt(
+            HTML_VALIDATION_PROMPT_TEMPLATE, {},
+            issues=validation_report['all_issues'],
+            warnings=validation_report['all_warnings'],
+            fixes=validation_report['all_fixes'],
+            html=cleaned_html
+        )
         
         messages = self.get_messages(validation_prompt)
         response = self.invoke_llm_with_retry(messages, "HTML/CSS/JS Validation")
@@ -5,9 +5,188 @@ This module contains agents responsible for generating final campaign deliverabl
 including websites and PDF reports.
 """
 
-from .base_agent import BaseAgent
+from html.parser import HTMLParser
+from .base_agent import BaseAgent, prompt_template, render_prompt
 from ..utils.state import State
 
+# User prompts are dedented once at import and filled with a single format_map per run
+WEBSITE_PROMPT_TEMPLATE = prompt_template("""
+    Create a comprehensive, professional campaign presentation website using ALL the following campaign information:
+
+    CAMPAIGN BRIEF:
+    {campaign_brief}
+
+    STRATEGY:
+    {strategy}
+
+    AUDIENCE PERSONAS:
+    {audience_personas}
+
+    CREATIVE CONCEPTS:
+    {creative_concepts}
+
+    COPY CONTENT:
+    {copy}
+
+    CTA OPTIMIZATION:
+    {cta_optimization}
+
+    MEDIA PLAN:
+    {media_plan}
+
+    CLIENT SUMMARY:
+    {client_summary}
+
+    CAMPAIGN SUMMARY:
+    {campaign_summary}
+
+    SOCIAL MEDIA CAMPAIGN:
+    {social_media_campaign}
+
+    EMOTION PERSONALIZATION:
+    {emotion_personalization}
+
+    VISUAL ASSETS:
+    Image URL: {image_url}
+    Image Description: {image_prompt}
+    IMPORTANT: For all images, use https://placehold.co/600x400?text= as placeholder images, where text= is the image description and 600x400 is the size (can be any size as widthxheight)
+
+    WEBSITE TEMPLATE:
+    https://marketinai.s3.ca-central-1.amazonaws.com/public/base.html
+
+    WEBSITE REQUIREMENTS:
+    1. Create a complete HTML page with embedded CSS and JavaScript
+    2. Design as a professional campaign presentation website, not a landing page
+    3. Use modern CSS with gradients, shadows, animations, and professional styling
+    4. Include all campaign sections: Executive Summary, Strategy, Audience, Creative, Copy, CTA, Media, Social Media, Emotion Personalization, Impact
+    5. PROMINENTLY DISPLAY THE GENERATED IMAGE in multiple ways:
+       - Hero section with the image as background or featured element
+       - Visual concepts section showcasing the image with description
+       - Creative assets section highlighting the image
+       - Add visual storytelling around the image
+       - Create interactive image galleries or carousels
+       - Include image analysis and creative insights
+    6. Make it mobile-responsive with CSS Grid/Flexbox
+    7. Include interactive elements, hover effects, and smooth transitions
+    8. Add proper meta tags for SEO
+    9. Use professional color schemes and modern typography
+    10. Include data visualization elements and progress indicators
+    11. Add navigation menu and smooth scrolling
+    12. Create a comprehensive footer with contact information
+    13. Include campaign metrics and performance indicators
+    14. Add professional presentation elements like slides and sections
+    15. Use modern UI components like cards, modals, and tooltips
+    16. Create a dedicated "Visual Concepts" or "Creative Assets" section
+    17. Include image analysis and creative direction insights
+    18. Add visual storytelling elements around the campaign image
+    19. Create a dedicated "Social Media Campaign" section showcasing TikTok and Instagram strategies
+    20. Include a "Hyperpersonalization" section with emotion-based messaging for all emotion types:
+        (HAPPY, EXCITED, CALM, ANXIOUS, CONFIDENT, CURIOUS, SAD, ANGRY, SCARED, DISGUSTED, SURPRISED, LOVED, JEALOUS)
+    21. Add interactive elements for emotion selection and personalized content display
+    22. Include social media previews and platform-specific content examples
+    23. Add emotion-based content variations and personalization tools
+    24. Include hashtag strategies and trending keywords for social media
+    25. Add influencer collaboration opportunities and user-generated content strategies
+    26. IMPORTANT: Create a dropdown navigation menu for all sections do not add a menu bar at the top of the page
+    27. Include tabs for different emotion message variations
+
+    IMPORTANT: The generated image should be a central visual element throughout the website, not just a small thumbnail. 
+    Use it prominently in the hero section, creative concepts section, and as a key visual asset in the presentation.
+    Include the image description and creative insights as part of the visual storytelling.
+    
+    Generate a complete, professional campaign presentation website that showcases the entire campaign comprehensively.
+    The website should look like a modern, beautiful presentation suitable for client meetings and stakeholder reviews.
+""")
+
+PDF_PROMPT_TEMPLATE = prompt_template("""
+    Create a comprehensive, professional PDF report using ALL the following campaign information:
+
+    CAMPAIGN BRIEF:
+    {campaign_brief}
+
+    STRATEGY:
+    {strategy}
+
+    AUDIENCE PERSONAS:
+    {audience_personas}
+
+    CREATIVE CONCEPTS:
+    {creative_concepts}
+
+    COPY CONTENT:
+    {copy}
+
+    CTA OPTIMIZATION:
+    {cta_optimization}
+
+    MEDIA PLAN:
+    {media_plan}
+
+    CLIENT SUMMARY:
+    {client_summary}
+
+    CAMPAIGN SUMMARY:
+    {campaign_summary}
+
+    SOCIAL MEDIA CAMPAIGN:
+    {social_media_campaign}
+
+    EMOTION PERSONALIZATION:
+    {emotion_personalization}
+
+    VISUAL ASSETS:
+    Image URL: {image_url}
+    Image Description: {image_prompt}
+
+    WORKFLOW METRICS:
+    Revision Count: {revision_count}
+
+    PDF REPORT REQUIREMENTS:
+    1. Create a comprehensive report structure with proper sections
+    2. Include executive summary at the beginning
+    3. Organize content logically: Strategy → Audience → Creative → Copy → Media → Results
+    4. Include all campaign data in well-formatted sections
+    5. Add visual descriptions and image information
+    6. Include workflow metrics and revision history
+    7. Provide clear recommendations and next steps
+    8. Use professional formatting with headers, subheaders, and bullet points
+    9. Include business impact and ROI projections
+    10. Add contact information and follow-up actions
+    11. Include appendices with detailed data if needed
+    12. Create a table of contents structure
+    13. Include social media campaign strategies and emotion personalization insights
+    14. Add comprehensive visual asset documentation
+
+    Generate a complete, professional PDF report that showcases the entire campaign comprehensively.
+""")
+
+
+class _TagBalanceChecker(HTMLParser):
+    """Incrementally tracks open HTML tags so structure can be checked while the page streams in"""
+    
+    VOID_TAGS = frozenset({
+        "area", "base", "br", "col", "embed", "hr", "img", "input",
+        "link", "meta", "param", "source", "track", "wbr"
+    })
+    
+    def __init__(self):
+        super().__init__()
+        self.open_tags = []
+        self.stray_closing_tags = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag not in self.VOID_TAGS:
+            self.open_tags.append(tag)
+    
+    def handle_endtag(self, tag):
+        if tag in self.VOID_TAGS:
+            return
+        if tag in self.open_tags:
+            # Implicitly close anything left open inside this element
+            while self.open_tags.pop() != tag:
+                pass
+        else:
+            self.stray_closing_tags.append(tag)
 
 
 class WebDeveloper(BaseAgent):
@@ -21,6 +200,8 @@ class WebDeveloper(BaseAgent):
     - SEO and accessibility optimization
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the web developer responsible for creating a comprehensive campaign presentation website.
@@ -58,113 +239,32 @@ class WebDeveloper(BaseAgent):
         )
     
     def run(self, state: State) -> dict:
-        # Extract all campaign artifacts
-        campaign_brief = state['campaign_brief']
-        strategy = state['artifacts'].get('strategy', '')
-        audience_personas = state['artifacts'].get('audience_personas', '')
-        creative_concepts = state['artifacts'].get('creative_concepts', '')
-        copy_content = state['artifacts'].get('copy', '')
-        cta_optimization = state['artifacts'].get('cta_optimization', '')
-        media_plan = state['artifacts'].get('media_plan', '')
-        client_summary = state['artifacts'].get('client_summary', '')
-        campaign_summary = state['artifacts'].get('campaign_summary', '')
-        social_media_campaign = state['artifacts'].get('social_media_campaign', '')
-        emotion_personalization = state['artifacts'].get('emotion_personalization', '')
-        visual_data = state['artifacts'].get('visual', {})
-        image_url = visual_data.get('image_url', '')
-        image_prompt = visual_data.get('image_prompt', '')
-        
-        # Create comprehensive campaign presentation website prompt
-        comprehensive_prompt = f"""
-        Create a comprehensive, professional campaign presentation website using ALL the following campaign information:
-
-        CAMPAIGN BRIEF:
-        {campaign_brief}
-
-        STRATEGY:
-        {strategy}
-
-        AUDIENCE PERSONAS:
-        {audience_personas}
-
-        CREATIVE CONCEPTS:
-        {creative_concepts}
-
-        COPY CONTENT:
-        {copy_content}
-
-        CTA OPTIMIZATION:
-        {cta_optimization}
-
-        MEDIA PLAN:
-        {media_plan}
-
-        CLIENT SUMMARY:
-        {client_summary}
-
-        CAMPAIGN SUMMARY:
-        {campaign_summary}
-
-        SOCIAL MEDIA CAMPAIGN:
-        {social_media_campaign}
-
-        EMOTION PERSONALIZATION:
-        {emotion_personalization}
-
-        VISUAL ASSETS:
-        Image URL: {image_url}
-        Image Description: {image_prompt}
-        IMPORTANT: For all images, use https://placehold.co/600x400?text= as placeholder images, where text= is the image description and 600x400 is the size (can be any size as widthxheight)
-
-        WEBSITE TEMPLATE:
-        https://marketinai.s3.ca-central-1.amazonaws.com/public/base.html
-
-        WEBSITE REQUIREMENTS:
-        1. Create a complete HTML page with embedded CSS and JavaScript
-        2. Design as a professional campaign presentation website, not a landing page
-        3. Use modern CSS with gradients, shadows, animations, and professional styling
-        4. Include all campaign sections: Executive Summary, Strategy, Audience, Creative, Copy, CTA, Media, Social Media, Emotion Personalization, Impact
-        5. PROMINENTLY DISPLAY THE GENERATED IMAGE in multiple ways:
-           - Hero section with the image as background or featured element
-           - Visual concepts section showcasing the image with description
-           - Creative assets section highlighting the image
-           - Add visual storytelling around the image
-           - Create interactive image galleries or carousels
-           - Include image analysis and creative insights
-        6. Make it mobile-responsive with CSS Grid/Flexbox
-        7. Include interactive elements, hover effects, and smooth transitions
-        8. Add proper meta tags for SEO
-        9. Use professional color schemes and modern typography
-        10. Include data visualization elements and progress indicators
-        11. Add navigation menu and smooth scrolling
-        12. Create a comprehensive footer with contact information
-        13. Include campaign metrics and performance indicators
-        14. Add professional presentation elements like slides and sections
-        15. Use modern UI components like cards, modals, and tooltips
-        16. Create a dedicated "Visual Concepts" or "Creative Assets" section
-        17. Include image analysis and creative direction insights
-        18. Add visual storytelling elements around the campaign image
-        19. Create a dedicated "Social Media Campaign" section showcasing TikTok and Instagram strategies
-        20. Include a "Hyperpersonalization" section with emotion-based messaging for all emotion types:
-            (HAPPY, EXCITED, CALM, ANXIOUS, CONFIDENT, CURIOUS, SAD, ANGRY, SCARED, DISGUSTED, SURPRISED, LOVED, JEALOUS)
-        21. Add interactive elements for emotion selection and personalized content display
-        22. Include social media previews and platform-specific content examples
-        23. Add emotion-based content variations and personalization tools
-        24. Include hashtag strategies and trending keywords for social media
-        25. Add influencer collaboration opportunities and user-generated content strategies
-        26. IMPORTANT: Create a dropdown navigation menu for all sections do not add a menu bar at the top of the page
-        27. Include tabs for different emotion message variations
-
-        IMPORTANT: The generated image should be a central visual element throughout the website, not just a small thumbnail. 
-        Use it prominently in the hero section, creative concepts section, and as a key visual asset in the presentation.
-        Include the image description and creative insights as part of the visual storytelling.
-        
-        Generate a complete, professional campaign presentation website that showcases the entire campaign comprehensively.
-        The website should look like a modern, beautiful presentation suitable for client meetings and stakeholder reviews.
-        """
+        artifacts = state.get('artifacts', {})
+        visual_data = artifacts.get('visual', {})
+        comprehensive_prompt = render_prompt(
+            WEBSITE_PROMPT_TEMPLATE, artifacts,
+            campaign_brief=state['campaign_brief'],
+            image_url=visual_data.get('image_url', ''),
+            image_prompt=visual_data.get('image_prompt', '')
+        )
         print("IM THE WEBSITER")
         messages = self.get_messages(comprehensive_prompt)
-        response = self.invoke_llm_with_retry(messages, "Campaign Website Generation")
+        # Stream the page so its tag structure is checked while the model is still writing it
+        checker = _TagBalanceChecker()
+        
+        def restart():
+            # A retried stream starts the page over, so check it with a fresh parser
+            nonlocal checker
+            checker = _TagBalanceChecker()
+        
+        response = self.invoke_llm_with_retry(
+            messages, "Campaign Website Generation",
+            on_chunk=lambda text: checker.feed(text), on_restart=restart
+        )
+        checker.close()
+        if checker.open_tags or checker.stray_closing_tags:
+            print(f"⚠️ Generated website has unbalanced tags (unclosed: {checker.open_tags[-5:]}, "
+                  f"stray closing: {checker.stray_closing_tags[:5]})")
         print(f"Comprehensive campaign presentation website generated with all campaign data")
         return self.return_state(state, response, {"web_developer": {"campaign_website": response.content}})
 
@@ -181,6 +281,8 @@ class PDFGeneratorTeam(BaseAgent):
     - Business impact analysis
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are a PDF generation specialist responsible for creating comprehensive campaign reports.
@@ -206,85 +308,16 @@ class PDFGeneratorTeam(BaseAgent):
         )
 
     def run(self, state: State) -> dict:
-        # Extract all campaign artifacts
-        campaign_brief = state['campaign_brief']
-        strategy = state['artifacts'].get('strategy', '')
-        audience_personas = state['artifacts'].get('audience_personas', '')
-        creative_concepts = state['artifacts'].get('creative_concepts', '')
-        copy_content = state['artifacts'].get('copy', '')
-        cta_optimization = state['artifacts'].get('cta_optimization', '')
-        media_plan = state['artifacts'].get('media_plan', '')
-        client_summary = state['artifacts'].get('client_summary', '')
-        campaign_summary = state['artifacts'].get('campaign_summary', '')
-        social_media_campaign = state['artifacts'].get('social_media_campaign', '')
-        emotion_personalization = state['artifacts'].get('emotion_personalization', '')
-        visual_data = state['artifacts'].get('visual', {})
-        image_url = visual_data.get('image_url', '')
-        image_prompt = visual_data.get('image_prompt', '')
+        artifacts = state.get('artifacts', {})
+        visual_data = artifacts.get('visual', {})
         revision_count = state.get('revision_count', 0)
-        
-        # Create comprehensive PDF report prompt
-        comprehensive_prompt = f"""
-        Create a comprehensive, professional PDF report using ALL the following campaign information:
-
-        CAMPAIGN BRIEF:
-        {campaign_brief}
-
-        STRATEGY:
-        {strategy}
-
-        AUDIENCE PERSONAS:
-        {audience_personas}
-
-        CREATIVE CONCEPTS:
-        {creative_concepts}
-
-        COPY CONTENT:
-        {copy_content}
-
-        CTA OPTIMIZATION:
-        {cta_optimization}
-
-        MEDIA PLAN:
-        {media_plan}
-
-        CLIENT SUMMARY:
-        {client_summary}
-
-        CAMPAIGN SUMMARY:
-        {campaign_summary}
-
-        SOCIAL MEDIA CAMPAIGN:
-        {social_media_campaign}
-
-        EMOTION PERSONALIZATION:
-        {emotion_personalization}
-
-        VISUAL ASSETS:
-        Image URL: {image_url}
-        Image Description: {image_prompt}
-
-        WORKFLOW METRICS:
-        Revision Count: {revision_count}
-
-        PDF REPORT REQUIREMENTS:
-        1. Create a comprehensive report structure with proper sections
-        2. Include executive summary at the beginning
-        3. Organize content logically: Strategy → Audience → Creative → Copy → Media → Results
-        4. Include all campaign data in well-formatted sections
-        5. Add visual descriptions and image information
-        6. Include workflow metrics and revision history
-        7. Provide clear recommendations and next steps
-        8. Use professional formatting with headers, subheaders, and bullet points
-        9. Include business impact and ROI projections
-        10. Add contact information and follow-up actions
-        11. Include appendices with detailed data if needed
-        12. Create a table of contents structure
-        13. Include social media campaign strategies and emotion personalization insights
-        14. Add comprehensive visual asset documentation
-
-        Generate a complete, professional PDF report that showcases the entire campaign comprehensively.
-        """
+        comprehensive_prompt = render_prompt(
+            PDF_PROMPT_TEMPLATE, artifacts,
+            campaign_brief=state['campaign_brief'],
+            image_url=visual_data.get('image_url', ''),
+            image_prompt=visual_data.get('image_prompt', ''),
+            revision_count=revision_count
+        )
         
         messages = self.get_messages(comprehensive_prompt)
         response = self.invoke_llm_with_retry(messages, "PDF Report Generation")
@@ -5,9 +5,29 @@ This module contains agents with specialized focus areas including social media
 emotion-based personalization, media planning, and client communications.
 """
 
-from .base_agent import BaseAgent
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import AIMessage
+from .base_agent import BaseAgent, campaign_id_from_config
 from ..utils.state import State
 
+# Emotion types for personalized messaging, with the register each variant is written in
+EMOTIONS = (
+    ("HAPPY", "joyful, positive, celebratory messaging"),
+    ("EXCITED", "energetic, enthusiastic, motivational content"),
+    ("CALM", "peaceful, reassuring, zen-like messaging"),
+    ("ANXIOUS", "supportive, comforting, solution-focused content"),
+    ("CONFIDENT", "empowering, bold, achievement-oriented messaging"),
+    ("CURIOUS", "intriguing, educational, discovery-focused content"),
+    ("SAD", "supportive, uplifting, hope-focused content"),
+    ("ANGRY", "understanding, solution-oriented, empowering messaging"),
+    ("SCARED", "reassuring, protective, confidence-building content"),
+    ("DISGUSTED", "clean, fresh, improvement-focused messaging"),
+    ("SURPRISED", "exciting, revelation-based, attention-grabbing content"),
+    ("LOVED", "warm, appreciation-focused, community-driven messaging"),
+    ("JEALOUS", "aspirational, achievement-focused, motivational content"),
+)
+
 
 class SocialMediaCampaignAgent(BaseAgent):
     """
@@ -21,6 +41,8 @@ class SocialMediaCampaignAgent(BaseAgent):
     - User-generated content strategies
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the social media campaign specialist responsible for creating comprehensive
@@ -41,23 +63,15 @@ class SocialMediaCampaignAgent(BaseAgent):
             llm=llm
         )
     
-    def run(self, state: State) -> dict:
-        campaign_brief = state['campaign_brief']
-        strategy = state['artifacts'].get('strategy', '')
-        audience_personas = state['artifacts'].get('audience_personas', '')
-        creative_concepts = state['artifacts'].get('creative_concepts', '')
-        copy_content = state['artifacts'].get('copy', '')
-        
+    def prepare(self, state: State) -> tuple:
         messages = self.get_messages(
-            f"Create a comprehensive social media campaign for TikTok and Instagram based on: "
-            f"Campaign Brief: {campaign_brief}, "
-            f"Strategy: {strategy}, "
-            f"Audience Personas: {audience_personas}, "
-            f"Creative Concepts: {creative_concepts}, "
-            f"Copy Content: {copy_content}. "
-            f"Include platform-specific strategies, trending hashtags, content ideas, and engagement tactics."
+            "Create a comprehensive social media campaign for TikTok and Instagram based on the campaign above. "
+            "Include platform-specific strategies, trending hashtags, content ideas, and engagement tactics.",
+            shared_context=self.shared_context(state)
         )
-        response = self.invoke_llm_with_retry(messages, "Social Media Campaign Development")
+        return messages, "Social Media Campaign Development"
+    
+    def finish(self, state: State, response) -> dict:
         return self.return_state(state, response, {"social_media_campaign": response.content})
 
 
@@ -73,28 +87,18 @@ class EmotionPersonalizationAgent(BaseAgent):
     - Personalized CTA optimization
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the emotion personalization specialist responsible for creating
-            hyperpersonalized campaign messages based on different emotion types. Your role is to develop
-            targeted messaging for each emotion category to maximize engagement and connection.
+            hyperpersonalized campaign messages for an audience in a specific emotional state. Each request
+            names a single emotion type and its tone; your role is to develop targeted messaging for that
+            one emotion only, to maximize engagement and connection.
             
-            Create personalized messages for these emotion types:
-            - HAPPY: Joyful, positive, celebratory messaging
-            - EXCITED: Energetic, enthusiastic, motivational content
-            - CALM: Peaceful, reassuring, zen-like messaging
-            - ANXIOUS: Supportive, comforting, solution-focused content
-            - CONFIDENT: Empowering, bold, achievement-oriented messaging
-            - CURIOUS: Intriguing, educational, discovery-focused content
-            - SAD: Supportive, uplifting, hope-focused content
-            - ANGRY: Understanding, solution-oriented, empowering messaging
-            - SCARED: Reassuring, protective, confidence-building content
-            - DISGUSTED: Clean, fresh, improvement-focused messaging
-            - SURPRISED: Exciting, revelation-based, attention-grabbing content
-            - LOVED: Warm, appreciation-focused, community-driven messaging
-            - JEALOUS: Aspirational, achievement-focused, motivational content
+            Write only the variant for the requested emotion, and do not cover any other emotion types.
             
-            Develop for each emotion:
+            Develop for the requested emotion:
             - Personalized copy variations
             - Visual style recommendations
             - Tone and voice adjustments
@@ -104,24 +108,46 @@ class EmotionPersonalizationAgent(BaseAgent):
             llm=llm
         )
     
-    def run(self, state: State) -> dict:
-        campaign_brief = state['campaign_brief']
-        copy_content = state['artifacts'].get('copy', '')
-        cta_optimization = state['artifacts'].get('cta_optimization', '')
-        audience_personas = state['artifacts'].get('audience_personas', '')
+    def emotion_requests(self, state: State) -> list:
+        """
+        One short request per emotion instead of one very long response for all of them.
         
-        messages = self.get_messages(
-            f"Create hyperpersonalized campaign messages for each emotion type based on: "
-            f"Campaign Brief: {campaign_brief}, "
-            f"Copy Content: {copy_content}, "
-            f"CTA Optimization: {cta_optimization}, "
-            f"Audience Personas: {audience_personas}. "
-            f"Develop personalized messaging for all 13 emotion types: "
-            f"HAPPY, EXCITED, CALM, ANXIOUS, CONFIDENT, CURIOUS, SAD, ANGRY, SCARED, DISGUSTED, SURPRISED, LOVED, JEALOUS. "
-            f"Include copy variations, visual recommendations, tone adjustments, and engagement strategies for each emotion."
+        Every request starts with the same system prompt and campaign context, so with prompt
+        caching only the emotion-specific suffix is processed anew.
+        """
+        shared_context = self.shared_context(state)
+        return [
+            (emotion, self.get_messages(
+                f"Develop personalized messaging for the {emotion} emotion type ({tone}). "
+                "Base this hyperpersonalized campaign message on the campaign above, especially its copy, CTAs and personas. "
+                "Include copy variations, visual recommendations, tone adjustments, and engagement strategies.",
+                shared_context=shared_context
+            ))
+            for emotion, tone in EMOTIONS
+        ]
+    
+    def combine(self, state: State, responses: list) -> dict:
+        """Merge the per-emotion responses into one artifact, in the fixed emotion order"""
+        content = "\n\n".join(
+            f"## {emotion}\n\n{response.content}" for (emotion, _), response in zip(EMOTIONS, responses)
         )
-        response = self.invoke_llm_with_retry(messages, "Emotion-Based Personalization")
-        return self.return_state(state, response, {"emotion_personalization": response.content})
+        return self.return_state(state, AIMessage(content=content), {"emotion_personalization": content})
+    
+    def run(self, state: State) -> dict:
+        requests = self.emotion_requests(state)
+        with ThreadPoolExecutor(max_workers=len(requests)) as pool:
+            responses = list(pool.map(
+                lambda request: self.invoke_llm_with_retry(request[1], f"Emotion-Based Personalization ({request[0]})"),
+                requests
+            ))
+        return self.combine(state, responses)
+    
+    async def arun(self, state: State) -> dict:
+        responses = await asyncio.gather(*(
+            self.ainvoke_llm_with_retry(messages, f"Emotion-Based Personalization ({emotion})")
+            for emotion, messages in self.emotion_requests(state)
+        ))
+        return self.combine(state, responses)
 
 
 class MediaPlanner(BaseAgent):
@@ -136,6 +162,8 @@ class MediaPlanner(BaseAgent):
     - Cross-platform campaign coordination
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the media planning specialist.
@@ -145,16 +173,16 @@ class MediaPlanner(BaseAgent):
             llm=llm
         )
     
-    def run(self, state: State) -> dict:
-        campaign_brief = state['campaign_brief']
-        personas = state['artifacts'].get('audience_personas', '')
-        
+    def prepare(self, state: State) -> tuple:
         messages = self.get_messages(
-            f"Based on this campaign brief: {campaign_brief} and audience personas: {personas}, "
-            f"recommend the optimal media mix for this campaign. Include specific platforms, "
-            f"budget allocation, and reasoning for each recommendation."
+            "Based on the campaign brief and audience personas above, "
+            "recommend the optimal media mix for this campaign. Include specific platforms, "
+            "budget allocation, and reasoning for each recommendation.",
+            shared_context=self.shared_context(state)
         )
-        response = self.invoke_llm_with_retry(messages, "Media Planning Strategy")
+        return messages, "Media Planning Strategy"
+    
+    def finish(self, state: State, response) -> dict:
         return self.return_state(state, response, {"media_plan": response.content})
 
 
@@ -170,6 +198,8 @@ class ClientSummaryGenerator(BaseAgent):
     - Strategic next steps and action items
     """
     
+    __slots__ = ()
+    
     def __init__(self, llm):
         super().__init__(
             system_prompt="""You are the client summary specialist.
@@ -179,19 +209,24 @@ class ClientSummaryGenerator(BaseAgent):
             llm=llm
         )
     
-    def run(self, state: State) -> dict:
-        campaign_brief = state['campaign_brief']
-        strategy = state['artifacts'].get('strategy', '')
+    def prepare(self, state: State) -> tuple:
         media_plan = state['artifacts'].get('media_plan', '')
-        cta_optimization = state['artifacts'].get('cta_optimization', '')
         
         messages = self.get_messages(
-            f"Create an executive summary for the client based on: "
-            f"Campaign Brief: {campaign_brief}, "
-            f"Strategy: {strategy}, "
-            f"Media Plan: {media_plan}, "
-            f"CTA Optimization: {cta_optimization}. "
-            f"Focus on business value, expected outcomes, and ROI projections."
+            f"Create an executive summary for the client based on the campaign above and this "
+            f"Media Plan: {media_plan}. "
+            f"Focus on business value, expected outcomes, and ROI projections.",
+            shared_context=self.shared_context(state)
+        )
+        return messages, "Client Executive Summary"
+    
+    def finish(self, state: State, response) -> dict:
+        return self.return_state(state, response, {"client_summary": response.content})
+    
+    def run(self, state: State, config=None) -> dict:
+        # The summary runs to several thousand tokens; publish it as it streams rather than at the end
+        messages, context = self.prepare(state)
+        response = self.invoke_llm_publishing_partials(
+            messages, context, "client_summary", campaign_id_from_config(config)
         )
-        response = self.invoke_llm_with_retry(messages, "Client Executive Summary")
-        return self.return_state(state, response, {"client_summary": response.content}) 
\ No newline at end of file
+        return self.finish(state, response)
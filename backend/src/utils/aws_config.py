@@ -6,17 +6,74 @@ from environment variables for S3 and DynamoDB services.
 """
 
 import os
+import logging
+import boto3
+from functools import lru_cache
 from typing import Dict, Any, Optional
+from botocore.config import Config
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (once per process tree; see setup_aws.py)
+if not os.environ.get('_DOTENV_LOADED'):
+    load_dotenv()
+    os.environ['_DOTENV_LOADED'] = '1'
+
+logger = logging.getLogger(__name__)
+
+
+def new_session() -> boto3.session.Session:
+    """A boto3 session for the credentials currently in the environment"""
+    return boto3.session.Session(
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+        aws_session_token=os.getenv('AWS_SESSION_TOKEN')
+    )
+
+
+@lru_cache(maxsize=None)
+def _shared_session(access_key_id: Optional[str], secret_access_key: Optional[str]) -> boto3.session.Session:
+    """One session per set of credentials, so credentials and botocore's service models are loaded once"""
+    return boto3.session.Session(aws_access_key_id=access_key_id, aws_secret_access_key=secret_access_key)
+
+
+@lru_cache(maxsize=None)
+def _shared_handle(kind: str, service: str, region: str, config: Optional[Config],
+                   access_key_id: Optional[str], secret_access_key: Optional[str]):
+    session = _shared_session(access_key_id, secret_access_key)
+    return getattr(session, kind)(service, region_name=region, config=config)
+
+
+def _aws_handle(kind: str, service: str, region: str, config: Optional[Config]):
+    # Temporary (session-token) credentials expire, so only permanent keys are shared; keying the
+    # cache on the keys means changed credentials get a new session rather than the old one
+    if os.getenv('AWS_SESSION_TOKEN'):
+        return getattr(new_session(), kind)(service, region_name=region, config=config)
+    return _shared_handle(kind, service, region, config,
+                          os.getenv('AWS_ACCESS_KEY_ID'), os.getenv('AWS_SECRET_ACCESS_KEY'))
+
+
+def aws_client(service: str, region: str, config: Optional[Config] = None):
+    """boto3 client for a service and region, shared across the process unless credentials are temporary"""
+    return _aws_handle('client', service, region, config)
+
+
+def aws_resource(service: str, region: str, config: Optional[Config] = None):
+    """boto3 resource for a service and region, shared across the process unless credentials are temporary"""
+    return _aws_handle('resource', service, region, config)
 
 
 class AWSConfig:
-    """AWS configuration management"""
+    """AWS configuration management (values are read from the environment once and cached)"""
+    
+    @staticmethod
+    def reset_cache():
+        """Forget cached configuration so the next call re-reads the environment"""
+        AWSConfig.get_s3_config.cache_clear()
+        AWSConfig.get_dynamodb_config.cache_clear()
+        AWSConfig.get_aws_credentials.cache_clear()
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_s3_config() -> Dict[str, str]:
         """Get S3 configuration from environment variables"""
         return {
@@ -28,6 +85,7 @@ class AWSConfig:
         }
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_dynamodb_config() -> Dict[str, str]:
         """Get DynamoDB configuration from environment variables"""
         return {
@@ -39,6 +97,7 @@ class AWSConfig:
         }
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_aws_credentials() -> Dict[str, Optional[str]]:
         """Get AWS credentials from environment variables"""
         return {
@@ -51,40 +110,40 @@ class AWSConfig:
     @staticmethod
     def validate_aws_config() -> bool:
         """Validate that required AWS configuration is present"""
-        required_vars = [
-            'AWS_ACCESS_KEY_ID',
-            'AWS_SECRET_ACCESS_KEY'
-        ]
+        credentials = AWSConfig.get_aws_credentials()
+        required_vars = {
+            'AWS_ACCESS_KEY_ID': credentials['access_key_id'],
+            'AWS_SECRET_ACCESS_KEY': credentials['secret_access_key']
+        }
         
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = [var for var, value in required_vars.items() if not value]
         
         if missing_vars:
-            print(f"❌ Missing required AWS environment variables: {', '.join(missing_vars)}")
-            print("Please check your .env file and ensure all required variables are set.")
+            logger.warning("Missing required AWS environment variables: %s. Please check your .env file.",
+                           ", ".join(missing_vars))
             return False
         
-        print("✅ AWS configuration validated successfully")
+        logger.debug("AWS configuration validated successfully")
         return True
     
     @staticmethod
     def print_config_summary():
-        """Print a summary of AWS configuration"""
+        """Log a summary of AWS configuration at DEBUG level"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         s3_config = AWSConfig.get_s3_config()
         dynamodb_config = AWSConfig.get_dynamodb_config()
         
-        print("🔧 AWS Configuration Summary:")
-        print(f"   S3 Bucket: {s3_config['bucket_name']} ({s3_config['region']})")
-        print(f"   DynamoDB Table: {dynamodb_config['table_name']} ({dynamodb_config['region']})")
-        print(f"   AWS Region: {s3_config['default_region']}")
-        
         # Check if credentials are set (without exposing them)
         credentials = AWSConfig.get_aws_credentials()
-        if credentials['access_key_id'] and credentials['secret_access_key']:
-            print("   AWS Credentials: ✅ Configured")
-        else:
-            print("   AWS Credentials: ❌ Not configured")
+        credentials_status = "configured" if credentials['access_key_id'] and credentials['secret_access_key'] else "not configured"
         
-        print()
+        logger.debug(
+            "AWS configuration: S3 bucket %s (%s), DynamoDB table %s (%s), region %s, credentials %s",
+            s3_config['bucket_name'], s3_config['region'],
+            dynamodb_config['table_name'], dynamodb_config['region'],
+            s3_config['default_region'], credentials_status
+        )
 
 
 def load_aws_services():
@@ -112,11 +171,11 @@ def load_aws_services():
             region=dynamodb_config['region']
         )
         
-        print("🚀 AWS services initialized successfully")
+        logger.info("AWS services initialized successfully")
         AWSConfig.print_config_summary()
         
         return s3_service, dynamodb_service
         
     except Exception as e:
-        print(f"❌ Failed to initialize AWS services: {e}")
+        logger.error("Failed to initialize AWS services: %s", e)
         return None, None 
\ No newline at end of file
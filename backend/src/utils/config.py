@@ -6,6 +6,7 @@ API keys, and other configuration settings.
 """
 
 import os
+import httpx
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from openai import OpenAI
@@ -21,8 +22,10 @@ def load_configuration():
     Raises:
         ValueError: If required environment variables are missing
     """
-    # Load environment variables
-    load_dotenv()
+    # Load environment variables (once per process tree; see setup_aws.py)
+    if not os.environ.get("_DOTENV_LOADED"):
+        load_dotenv()
+        os.environ["_DOTENV_LOADED"] = "1"
     
     # Get API keys and configuration
     openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -43,12 +46,20 @@ def load_configuration():
     print(f"   OpenRouter API Key: {'✅ Set' if openrouter_api_key else '❌ Missing'}")
     print(f"   OpenAI API Key: {'✅ Set' if openai_api_key else '❌ Missing'}")
     
-    # Initialize LLM client
+    # Initialize LLM client, shared by every agent so they all draw on one connection pool.
+    # The client keeps a retry of its own, which honours Retry-After on 429/5xx responses;
+    # invoke_llm_with_retry handles anything that still fails. Long non-streamed completions
+    # (campaign summary, website HTML) can take minutes, hence the generous timeout.
+    http_limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
     llm = ChatOpenAI(
         api_key=openrouter_api_key,
         base_url=openrouter_base_url,
         model_name=rational_model,
-        temperature=0.7
+        temperature=0.7,
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+        timeout=float(os.getenv("LLM_TIMEOUT", "300")),
+        http_client=httpx.Client(limits=http_limits),
+        http_async_client=httpx.AsyncClient(limits=http_limits)
     )
     
     # Initialize OpenAI client for DALL-E (if available)
@@ -6,7 +6,49 @@ particularly for generating and saving campaign outputs.
 """
 
 import os
-from datetime import datetime
+import re
+import shutil
+import sys
+import time
+from collections import Counter
+from functools import lru_cache
+
+_OUTPUTS_DIR = "outputs"
+
+# Every substring the website statistics count, found in a single scan (none of them overlap)
+_STATS_RE = re.compile(r'<section|<div class="section|button|cta|presentation|campaign|img|image|visual')
+_CODE_FENCE_RE = re.compile(r'```html|```')
+
+# Page wrapped around generated content that has no <html> element of its own
+_HTML_SHELL_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Campaign Presentation</title>
+</head>
+<body>
+{body}
+</body>
+</html>"""
+
+
+def _ts():
+    """Local-time filename prefix, YYYYMMDD_HHMMSS"""
+    return time.strftime("%Y%m%d_%H%M%S", time.localtime())
+
+
+@lru_cache(maxsize=1)
+def _ensure_outputs_dir():
+    """Create the outputs directory on first use; later calls are free"""
+    os.makedirs(_OUTPUTS_DIR, exist_ok=True)
+
+
+@lru_cache(maxsize=1)
+def _http_session():
+    """One requests session for image downloads, so repeated downloads reuse connections"""
+    import requests
+    return requests.Session()
 
 
 def create_campaign_website(result, filename="campaign_website.html"):
@@ -42,73 +84,67 @@ def create_campaign_website(result, filename="campaign_website.html"):
     
     if campaign_website_content:
         try:
-            # Create outputs directory if it doesn't exist
-            outputs_dir = "outputs"
-            if not os.path.exists(outputs_dir):
-                os.makedirs(outputs_dir)
-                print(f"📁 Created {outputs_dir} directory")
+            _ensure_outputs_dir()
             
             # Add timestamp to filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = _ts()
             filename = f"{timestamp}_{filename}"
-            filepath = os.path.join(outputs_dir, filename)
+            filepath = os.path.join(_OUTPUTS_DIR, filename)
+            
+            # Clean up any code block markers that might be in the content
+            campaign_website_content = _CODE_FENCE_RE.sub('', campaign_website_content)
             
             # Basic validation if not already validated
             if not validation_used:
-                # Ensure proper HTML structure
-                if not campaign_website_content.strip().find('<!DOCTYPE html>') == -1:
-                    print("⚠️ Warning: Adding missing DOCTYPE declaration")
-                    campaign_website_content = '<!DOCTYPE html>\n' + campaign_website_content
-                
-                if '<html' not in campaign_website_content:
-                    campaign_website_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Campaign Presentation</title>
-</head>
-<body>
-{campaign_website_content}
-</body>
-</html>"""
+                # Ensure proper HTML structure (the declaration must come first, so only the head is checked)
+                if '<html' in campaign_website_content:
+                    if not campaign_website_content[:64].lstrip().lower().startswith('<!doctype html'):
+                        print("⚠️ Warning: Adding missing DOCTYPE declaration")
+                        campaign_website_content = '<!DOCTYPE html>\n' + campaign_website_content
+                else:
+                    campaign_website_content = _HTML_SHELL_TEMPLATE.format(body=campaign_website_content)
             
-            # Clean up any code block markers that might be in the content
-            campaign_website_content = campaign_website_content.replace('```html', '').replace('```', '')
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(campaign_website_content)
+            # Encode once and hand the bytes to the file in one write (a buffered binary file passes
+            # writes larger than its buffer straight through, so the page goes out in a single call)
+            with open(filepath, 'wb') as f:
+                f.write(campaign_website_content.encode('utf-8'))
             
             # Calculate content statistics
             content_length = len(campaign_website_content)
-            sections_count = campaign_website_content.count('<section') + campaign_website_content.count('<div class="section')
-            cta_count = campaign_website_content.count('button') + campaign_website_content.count('cta')
-            presentation_elements = campaign_website_content.count('presentation') + campaign_website_content.count('campaign')
-            visual_elements = campaign_website_content.count('img') + campaign_website_content.count('image') + campaign_website_content.count('visual')
+            counts = Counter(_STATS_RE.findall(campaign_website_content))
+            sections_count = counts['<section'] + counts['<div class="section']
+            cta_count = counts['button'] + counts['cta']
+            presentation_elements = counts['presentation'] + counts['campaign']
+            visual_elements = counts['img'] + counts['image'] + counts['visual']
             
-            print(f"✅ Comprehensive campaign presentation website saved as {filepath}")
-            print(f"📊 Website Statistics:")
-            print(f"   - Content Length: {content_length:,} characters")
-            print(f"   - Sections: {sections_count}")
-            print(f"   - Interactive Elements: {cta_count}")
-            print(f"   - Presentation Elements: {presentation_elements}")
-            print(f"   - Visual Elements: {visual_elements}")
-            print(f"   - Campaign Data Used: {len(result.get('artifacts', {}))} artifacts")
-            print(f"   - HTML Validation: {'✅ Validated & Corrected' if validation_used else '⚠️ Basic validation only'}")
+            # Collect the report and write it in one go, so it isn't interleaved with other output
+            lines = [
+                f"✅ Comprehensive campaign presentation website saved as {filepath}",
+                "📊 Website Statistics:",
+                f"   - Content Length: {content_length:,} characters",
+                f"   - Sections: {sections_count}",
+                f"   - Interactive Elements: {cta_count}",
+                f"   - Presentation Elements: {presentation_elements}",
+                f"   - Visual Elements: {visual_elements}",
+                f"   - Campaign Data Used: {len(result.get('artifacts', {}))} artifacts",
+                f"   - HTML Validation: {'✅ Validated & Corrected' if validation_used else '⚠️ Basic validation only'}",
+            ]
             
             # Check for image integration
             if result.get('artifacts', {}).get('visual', {}).get('image_url'):
-                print(f"   - 🎨 Visual Concepts: Image integrated prominently")
+                lines.append("   - 🎨 Visual Concepts: Image integrated prominently")
             else:
-                print(f"   - ⚠️ Visual Concepts: No image URL found")
+                lines.append("   - ⚠️ Visual Concepts: No image URL found")
             
             # Display validation results if available
             if validation_used and html_validation:
-                print(f"   - 🔍 Validation Summary: {html_validation.get('validation_summary', 'N/A')}")
+                lines.append(f"   - 🔍 Validation Summary: {html_validation.get('validation_summary', 'N/A')}")
                 if html_validation.get('original_issues'):
-                    print(f"   - 🔧 Issues Fixed: {len(html_validation.get('original_issues', []))}")
+                    lines.append(f"   - 🔧 Issues Fixed: {len(html_validation.get('original_issues', []))}")
                 if html_validation.get('corrected_issues'):
-                    print(f"   - ⚠️ Remaining Issues: {len(html_validation.get('corrected_issues', []))}")
+                    lines.append(f"   - ⚠️ Remaining Issues: {len(html_validation.get('corrected_issues', []))}")
+            
+            sys.stdout.write("\n".join(lines) + "\n")
             
         except Exception as e:
             print(f"❌ Failed to save campaign website: {e}")
@@ -125,15 +161,12 @@ def save_campaign_pdf(content, filename="campaign_report.pdf"):
         filename: Output filename (default: "campaign_report.pdf")
     """
     try:
-        # Create outputs directory if it doesn't exist
-        outputs_dir = "outputs"
-        if not os.path.exists(outputs_dir):
-            os.makedirs(outputs_dir)
+        _ensure_outputs_dir()
         
         # Add timestamp to filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = _ts()
         filename = f"{timestamp}_{filename}"
-        filepath = os.path.join(outputs_dir, filename)
+        filepath = os.path.join(_OUTPUTS_DIR, filename)
         
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
@@ -153,25 +186,22 @@ def download_image(url, filename="generated_ad.png"):
         filename: Output filename (default: "generated_ad.png")
     """
     try:
-        import requests
-        
-        response = requests.get(url)
-        if response.status_code == 200:
-            # Create outputs directory if it doesn't exist
-            outputs_dir = "outputs"
-            if not os.path.exists(outputs_dir):
-                os.makedirs(outputs_dir)
-            
-            # Add timestamp to filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{timestamp}_{filename}"
-            filepath = os.path.join(outputs_dir, filename)
-            
-            with open(filepath, "wb") as f:
-                f.write(response.content)
-            print(f"✅ Image saved to {filepath}")
-        else:
-            print("❌ Failed to download image")
+        # Stream the body straight to disk instead of holding the whole image in memory
+        with _http_session().get(url, stream=True, timeout=30) as response:
+            if response.status_code == 200:
+                _ensure_outputs_dir()
+                
+                # Add timestamp to filename
+                timestamp = _ts()
+                filename = f"{timestamp}_{filename}"
+                filepath = os.path.join(_OUTPUTS_DIR, filename)
+                
+                response.raw.decode_content = True
+                with open(filepath, "wb") as f:
+                    shutil.copyfileobj(response.raw, f, 1024 * 1024)
+                print(f"✅ Image saved to {filepath}")
+            else:
+                print("❌ Failed to download image")
             
     except Exception as e:
         print(f"❌ Error downloading image: {e}")
@@ -185,17 +215,13 @@ def clean_output_directory(max_files=10):
         max_files: Maximum number of files to keep per type
     """
     try:
-        outputs_dir = "outputs"
-        if not os.path.exists(outputs_dir):
+        # Get all files in outputs directory with their modification times, from one directory scan
+        try:
+            with os.scandir(_OUTPUTS_DIR) as entries:
+                files = [(entry.path, entry.stat().st_mtime) for entry in entries if entry.is_file()]
+        except FileNotFoundError:
             return
         
-        # Get all files in outputs directory
-        files = []
-        for filename in os.listdir(outputs_dir):
-            filepath = os.path.join(outputs_dir, filename)
-            if os.path.isfile(filepath):
-                files.append((filepath, os.path.getmtime(filepath)))
-        
         # Sort by modification time (newest first)
         files.sort(key=lambda x: x[1], reverse=True)
         
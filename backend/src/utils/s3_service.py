@@ -6,16 +6,77 @@ including websites, PDFs, and workflow state data.
 """
 
 import os
-import json
-import boto3
+import gzip
+import hashlib
+import orjson
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
 import logging
 import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from .aws_config import aws_client
 
 logger = logging.getLogger(__name__)
 
+# Independent uploads run concurrently so a campaign's uploads take as long as the slowest one,
+# not their sum; boto3 clients are thread-safe. Tasks on this pool must not wait on other tasks.
+_upload_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="s3-upload")
+
+# Files above 8 MB go up as multipart uploads with parts sent in parallel
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# (bucket_name, region) pairs already confirmed to exist in this process
+_KNOWN_BUCKETS: set = set()
+
+# Room for concurrent uploads on one connection pool, kept alive between campaigns;
+# adaptive retries back off on throttling
+_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+
+# Object keys under campaigns/{campaign_id}/ and the file type each one holds
+CAMPAIGN_FILE_TYPES = {
+    'website/index.html': 'website',
+    'pdf/campaign_report.pdf': 'pdf',
+    'artifacts/workflow_state.json': 'artifacts',
+    'metadata/campaign_metadata.json': 'metadata',
+}
+
+# Local output file names: timestamped websites (YYYYMMDD_HHMMSS_campaign_website.html) and suffixes
+_TIMESTAMP_WEBSITE_RE = re.compile(r'\d{8}_\d{6}_campaign_website\.html$')
+_HTML_SUFFIX = '.html'
+_PDF_SUFFIX = '.pdf'
+
+# JSON documents are serialized straight to UTF-8 bytes, indented for readability in the console
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Bodies smaller than this aren't worth compressing
+GZIP_MIN_BYTES = 1024
+
+
+def _body_args(body: bytes) -> Dict[str, Any]:
+    """
+    put_object arguments for a text body, gzip-compressed when that makes it meaningfully smaller
+    
+    Browsers and HTTP clients decompress Content-Encoding: gzip transparently.
+    """
+    if len(body) >= GZIP_MIN_BYTES:
+        compressed = gzip.compress(body, compresslevel=6, mtime=0)
+        if len(compressed) < len(body) * 0.9:
+            return {'Body': compressed, 'ContentEncoding': 'gzip'}
+    return {'Body': body}
+
 
 class S3Service:
     """Service class for S3 operations"""
@@ -33,15 +94,12 @@ class S3Service:
         
         # Initialize S3 client
         try:
-            self.s3_client = boto3.client(
-                's3',
-                region_name=region,
-                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
-            )
+            self.s3_client = aws_client('s3', region, _CLIENT_CONFIG)
             
-            # Check if bucket exists, create if it doesn't
-            self._ensure_bucket_exists()
+            # Check if bucket exists, create if it doesn't (once per bucket per process)
+            if (bucket_name, region) not in _KNOWN_BUCKETS:
+                self._ensure_bucket_exists()
+                _KNOWN_BUCKETS.add((bucket_name, region))
             
             logger.info(f"S3 service initialized successfully for bucket: {bucket_name}")
             
@@ -74,13 +132,67 @@ class S3Service:
                 logger.error(f"Error checking bucket: {e}")
                 raise
     
-    def upload_campaign_website(self, campaign_id: str, html_content: str) -> str:
+    def _is_unchanged(self, s3_key: str, body_args: Dict[str, Any]) -> bool:
+        """
+        Check whether the object at s3_key already holds exactly this body
+        
+        For a single-part put_object the ETag is the MD5 of the stored bytes, and gzip output is
+        deterministic (mtime=0), so re-persisting an unchanged document can skip the upload.
+        Any doubt (missing object, other ETag format, failed HEAD) means "changed".
+        """
+        try:
+            head = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+        except ClientError:
+            return False
+        return (
+            head.get('ETag', '').strip('"') == hashlib.md5(body_args['Body']).hexdigest()
+            and head.get('ContentEncoding') == body_args.get('ContentEncoding')
+        )
+    
+    def _put_if_changed(self, campaign_id: str, s3_key: str, content_type: str, file_type: str, body: bytes) -> bool:
+        """
+        Upload a body with the campaign metadata, unless S3 already has the same bytes
+        
+        Returns:
+            True if the object was uploaded, False if the upload was skipped
+        """
+        body_args = _body_args(body)
+        if self._is_unchanged(s3_key, body_args):
+            logger.info(f"Skipped upload of unchanged {file_type}: {s3_key}")
+            return False
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            ContentType=content_type,
+            Metadata={
+                'campaign_id': campaign_id,
+                'upload_time': datetime.now().isoformat(),
+                'content_type': file_type
+            },
+            **body_args
+        )
+        return True
+    
+    def submit_upload(self, upload, *args) -> Future:
+        """
+        Start an upload on the shared upload pool
+        
+        Args:
+            upload: Upload method to call, e.g. self.upload_campaign_metadata
+            *args: Arguments for the upload method
+            
+        Returns:
+            Future resolving to the upload's S3 URL (or raising its error)
+        """
+        return _upload_executor.submit(upload, *args)
+    
+    def upload_campaign_website(self, campaign_id: str, html_content: Union[str, bytes]) -> str:
         """
         Upload campaign website HTML to S3
         
         Args:
             campaign_id: Unique campaign identifier
-            html_content: HTML content of the website
+            html_content: HTML content of the website (text, or UTF-8 bytes)
             
         Returns:
             S3 URL of the uploaded file
@@ -90,17 +202,9 @@ class S3Service:
             s3_key = f"campaigns/{campaign_id}/website/index.html"
             
             # Upload HTML content
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=html_content.encode('utf-8'),
-                ContentType='text/html',
-                Metadata={
-                    'campaign_id': campaign_id,
-                    'upload_time': datetime.now().isoformat(),
-                    'content_type': 'website'
-                }
-            )
+            if isinstance(html_content, str):
+                html_content = html_content.encode('utf-8')
+            self._put_if_changed(campaign_id, s3_key, 'text/html', 'website', html_content)
             
             # Generate S3 URL
             s3_url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
@@ -127,21 +231,21 @@ class S3Service:
             # Create S3 key for the PDF
             s3_key = f"campaigns/{campaign_id}/pdf/campaign_report.pdf"
             
-            # Upload PDF file
-            with open(pdf_file_path, 'rb') as pdf_file:
-                self.s3_client.upload_fileobj(
-                    pdf_file,
-                    self.bucket_name,
-                    s3_key,
-                    ExtraArgs={
-                        'ContentType': 'application/pdf',
-                        'Metadata': {
-                            'campaign_id': campaign_id,
-                            'upload_time': datetime.now().isoformat(),
-                            'content_type': 'pdf'
-                        }
+            # Upload PDF file (upload_file can read parts of the file in parallel)
+            self.s3_client.upload_file(
+                pdf_file_path,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={
+                    'ContentType': 'application/pdf',
+                    'Metadata': {
+                        'campaign_id': campaign_id,
+                        'upload_time': datetime.now().isoformat(),
+                        'content_type': 'pdf'
                     }
-                )
+                },
+                Config=_TRANSFER_CONFIG
+            )
             
             # Generate S3 URL
             s3_url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
@@ -169,20 +273,10 @@ class S3Service:
             s3_key = f"campaigns/{campaign_id}/artifacts/workflow_state.json"
             
             # Convert artifacts to JSON
-            artifacts_json = json.dumps(artifacts, indent=2, default=str)
+            artifacts_json = orjson.dumps(artifacts, default=str, option=_JSON_OPTIONS)
             
             # Upload artifacts
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=artifacts_json.encode('utf-8'),
-                ContentType='application/json',
-                Metadata={
-                    'campaign_id': campaign_id,
-                    'upload_time': datetime.now().isoformat(),
-                    'content_type': 'artifacts'
-                }
-            )
+            self._put_if_changed(campaign_id, s3_key, 'application/json', 'artifacts', artifacts_json)
             
             # Generate S3 URL
             s3_url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
@@ -210,20 +304,10 @@ class S3Service:
             s3_key = f"campaigns/{campaign_id}/metadata/campaign_metadata.json"
             
             # Convert metadata to JSON
-            metadata_json = json.dumps(metadata, indent=2, default=str)
+            metadata_json = orjson.dumps(metadata, default=str, option=_JSON_OPTIONS)
             
             # Upload metadata
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=metadata_json.encode('utf-8'),
-                ContentType='application/json',
-                Metadata={
-                    'campaign_id': campaign_id,
-                    'upload_time': datetime.now().isoformat(),
-                    'content_type': 'metadata'
-                }
-            )
+            self._put_if_changed(campaign_id, s3_key, 'application/json', 'metadata', metadata_json)
             
             # Generate S3 URL
             s3_url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
@@ -249,78 +333,67 @@ class S3Service:
         try:
             uploaded_urls = {}
             
-            # List all files in the outputs directory for debugging
-            all_files = os.listdir(local_outputs_dir) if os.path.exists(local_outputs_dir) else []
+            # List all files in the outputs directory in one scan (DirEntry.is_file needs no extra stat)
+            try:
+                with os.scandir(local_outputs_dir) as entries:
+                    all_files = [entry.name for entry in entries if entry.is_file()]
+            except FileNotFoundError:
+                all_files = []
             logger.info(f"Files in {local_outputs_dir}: {all_files}")
             
             # Upload website if exists - try multiple naming patterns
-            website_patterns = [
-                f"{campaign_id}_campaign_website.html",
-                f"{campaign_id}_website.html",
-                "campaign_website.html",
-                "index.html"
-            ]
-            
-            # Also look for timestamped files (format: YYYYMMDD_HHMMSS_campaign_website.html)
-            timestamp_pattern = re.compile(r'\d{8}_\d{6}_campaign_website\.html')
-            timestamped_files = [f for f in all_files if timestamp_pattern.match(f)]
-            if timestamped_files:
-                website_patterns.extend(timestamped_files)
-            
-            website_uploaded = False
-            for pattern in website_patterns:
-                website_path = os.path.join(local_outputs_dir, pattern)
-                if os.path.exists(website_path):
-                    logger.info(f"Found website file: {pattern}")
-                    try:
-                        with open(website_path, 'r', encoding='utf-8') as f:
-                            html_content = f.read()
-                        uploaded_urls['website'] = self.upload_campaign_website(campaign_id, html_content)
-                        website_uploaded = True
-                        logger.info(f"Successfully uploaded website: {pattern}")
-                        break
-                    except Exception as e:
-                        logger.error(f"Failed to upload website file {pattern}: {e}")
-            
-            # If no specific website file found, look for any HTML file with campaign ID
-            if not website_uploaded:
-                html_files = [f for f in all_files if f.endswith('.html') and campaign_id in f]
-                if html_files:
-                    website_path = os.path.join(local_outputs_dir, html_files[0])
-                    logger.info(f"Found HTML file with campaign ID: {html_files[0]}")
-                    try:
-                        with open(website_path, 'r', encoding='utf-8') as f:
-                            html_content = f.read()
-                        uploaded_urls['website'] = self.upload_campaign_website(campaign_id, html_content)
-                        website_uploaded = True
-                        logger.info(f"Successfully uploaded HTML file: {html_files[0]}")
-                    except Exception as e:
-                        logger.error(f"Failed to upload HTML file {html_files[0]}: {e}")
-            
-            # If still no website found, look for any HTML file that might be a campaign website
-            if not website_uploaded:
-                html_files = [f for f in all_files if f.endswith('.html')]
-                if html_files:
-                    website_path = os.path.join(local_outputs_dir, html_files[0])
-                    logger.info(f"Found general HTML file: {html_files[0]}")
-                    try:
-                        with open(website_path, 'r', encoding='utf-8') as f:
-                            html_content = f.read()
-                        uploaded_urls['website'] = self.upload_campaign_website(campaign_id, html_content)
-                        website_uploaded = True
-                        logger.info(f"Successfully uploaded general HTML file: {html_files[0]}")
-                    except Exception as e:
-                        logger.error(f"Failed to upload general HTML file {html_files[0]}: {e}")
-            
-            # Upload PDF if exists
-            pdf_files = [f for f in all_files if f.endswith('.pdf') and campaign_id in f]
+            website_patterns = {
+                name: index for index, name in enumerate([
+                    f"{campaign_id}_campaign_website.html",
+                    f"{campaign_id}_website.html",
+                    "campaign_website.html",
+                    "index.html"
+                ])
+            }
+            
+            # Pick the website and collect the PDFs in one pass over the names. Website candidates are
+            # ranked: a known name (in pattern order), then a timestamped file
+            # (YYYYMMDD_HHMMSS_campaign_website.html), then any HTML file with the campaign ID,
+            # then any HTML file at all; the first file seen wins within a rank
+            website_file, website_rank = None, None
+            pdf_files = []
+            for name in all_files:
+                if name.endswith(_PDF_SUFFIX):
+                    if campaign_id in name:
+                        pdf_files.append(name)
+                    continue
+                if not name.endswith(_HTML_SUFFIX):
+                    continue
+                if name in website_patterns:
+                    rank = (0, website_patterns[name])
+                elif _TIMESTAMP_WEBSITE_RE.match(name):
+                    rank = (1, 0)
+                elif campaign_id in name:
+                    rank = (2, 0)
+                else:
+                    rank = (3, 0)
+                if website_rank is None or rank < website_rank:
+                    website_file, website_rank = name, rank
+            
+            # Start the website and PDF uploads together, then wait for both
+            uploads = {}
+            if website_file:
+                logger.info(f"Found website file: {website_file}")
+                website_path = os.path.join(local_outputs_dir, website_file)
+                uploads['website'] = (website_file, self.submit_upload(self.upload_campaign_website_from_path, campaign_id, website_path))
+            
             if pdf_files:
-                pdf_path = os.path.join(local_outputs_dir, pdf_files[-1])  # Get most recent PDF
+                # listdir order is arbitrary; names are timestamp-prefixed, so the max is the most recent PDF
+                latest_pdf = max(pdf_files)
+                pdf_path = os.path.join(local_outputs_dir, latest_pdf)
+                uploads['pdf'] = (latest_pdf, self.submit_upload(self.upload_campaign_pdf, campaign_id, pdf_path))
+            
+            for file_type, (filename, future) in uploads.items():
                 try:
-                    uploaded_urls['pdf'] = self.upload_campaign_pdf(campaign_id, pdf_path)
-                    logger.info(f"Successfully uploaded PDF: {pdf_files[-1]}")
+                    uploaded_urls[file_type] = future.result()
+                    logger.info(f"Successfully uploaded {file_type}: {filename}")
                 except Exception as e:
-                    logger.error(f"Failed to upload PDF file {pdf_files[-1]}: {e}")
+                    logger.error(f"Failed to upload {file_type} file {filename}: {e}")
             
             logger.info(f"Uploaded {len(uploaded_urls)} campaign files to S3: {list(uploaded_urls.keys())}")
             return uploaded_urls
@@ -329,6 +402,22 @@ class S3Service:
             logger.error(f"Failed to upload campaign files: {e}")
             raise
     
+    def upload_campaign_website_from_path(self, campaign_id: str, website_path: str) -> str:
+        """
+        Upload a local campaign website file to S3
+        
+        The file's bytes are uploaded as they are, without decoding to text and encoding back.
+        
+        Args:
+            campaign_id: Unique campaign identifier
+            website_path: Local path to the HTML file
+            
+        Returns:
+            S3 URL of the uploaded file
+        """
+        with open(website_path, 'rb') as f:
+            return self.upload_campaign_website(campaign_id, f.read())
+    
     def get_campaign_files(self, campaign_id: str) -> Dict[str, str]:
         """
         Get S3 URLs for all campaign files
@@ -342,37 +431,13 @@ class S3Service:
         try:
             urls = {}
             
-            # Website URL
-            website_key = f"campaigns/{campaign_id}/website/index.html"
-            try:
-                self.s3_client.head_object(Bucket=self.bucket_name, Key=website_key)
-                urls['website'] = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{website_key}"
-            except ClientError:
-                pass
-            
-            # PDF URL
-            pdf_key = f"campaigns/{campaign_id}/pdf/campaign_report.pdf"
-            try:
-                self.s3_client.head_object(Bucket=self.bucket_name, Key=pdf_key)
-                urls['pdf'] = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{pdf_key}"
-            except ClientError:
-                pass
-            
-            # Artifacts URL
-            artifacts_key = f"campaigns/{campaign_id}/artifacts/workflow_state.json"
-            try:
-                self.s3_client.head_object(Bucket=self.bucket_name, Key=artifacts_key)
-                urls['artifacts'] = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{artifacts_key}"
-            except ClientError:
-                pass
-            
-            # Metadata URL
-            metadata_key = f"campaigns/{campaign_id}/metadata/campaign_metadata.json"
-            try:
-                self.s3_client.head_object(Bucket=self.bucket_name, Key=metadata_key)
-                urls['metadata'] = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{metadata_key}"
-            except ClientError:
-                pass
+            # One listing of the campaign's prefix instead of a HEAD request per file
+            prefix = f"campaigns/{campaign_id}/"
+            response = self.s3_client.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix)
+            for obj in response.get('Contents', []):
+                file_type = CAMPAIGN_FILE_TYPES.get(obj['Key'][len(prefix):])
+                if file_type:
+                    urls[file_type] = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{obj['Key']}"
             
             return urls
             
@@ -395,18 +460,28 @@ class S3Service:
             paginator = self.s3_client.get_paginator('list_objects_v2')
             pages = paginator.paginate(Bucket=self.bucket_name, Prefix=f"campaigns/{campaign_id}/")
             
-            objects_to_delete = []
+            # Delete page by page: a listing page holds at most 1000 keys, which is also the
+            # delete_objects limit, and Quiet mode only reports the keys that failed
+            deleted_count = 0
+            failed = []
             for page in pages:
-                if 'Contents' in page:
-                    objects_to_delete.extend([{'Key': obj['Key']} for obj in page['Contents']])
-            
-            if objects_to_delete:
-                # Delete all objects
-                self.s3_client.delete_objects(
+                objects_to_delete = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+                if not objects_to_delete:
+                    continue
+                response = self.s3_client.delete_objects(
                     Bucket=self.bucket_name,
-                    Delete={'Objects': objects_to_delete}
+                    Delete={'Objects': objects_to_delete, 'Quiet': True}
                 )
-                logger.info(f"Deleted {len(objects_to_delete)} files for campaign {campaign_id}")
+                errors = response.get('Errors', [])
+                failed.extend(errors)
+                deleted_count += len(objects_to_delete) - len(errors)
+            
+            if deleted_count:
+                logger.info(f"Deleted {deleted_count} files for campaign {campaign_id}")
+            if failed:
+                logger.error(f"Failed to delete {len(failed)} files for campaign {campaign_id}: "
+                             f"{[error.get('Key') for error in failed]}")
+                return False
             
             return True
             
@@ -4,6 +4,7 @@ State Management for Multi-Agent Workflow
 This module defines the shared state structure used throughout the campaign generation workflow.
 """
 
+import operator
 from typing import Annotated
 from typing_extensions import TypedDict
 from langgraph.graph.message import add_messages
@@ -16,7 +17,8 @@ class State(TypedDict):
     Attributes:
         messages: List of messages exchanged between agents
         campaign_brief: Initial campaign requirements and specifications
-        artifacts: Generated content from each agent (strategy, copy, visuals, etc.)
+        artifacts: Generated content from each agent (strategy, copy, visuals, etc.);
+            agents return only their new artifacts and the channel merges them in
         feedback: Feedback messages from review processes
         revision_count: Number of revision iterations performed
         previous_artifacts: Previous version of artifacts for change detection
@@ -24,7 +26,7 @@ class State(TypedDict):
     """
     messages: Annotated[list, add_messages]
     campaign_brief: dict
-    artifacts: Annotated[dict, {}]
+    artifacts: Annotated[dict, operator.or_]
     feedback: Annotated[list, add_messages]
     revision_count: int
     previous_artifacts: dict
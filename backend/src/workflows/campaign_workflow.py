@@ -5,8 +5,12 @@ This module defines the main campaign generation workflow using LangGraph,
 including agent orchestration, conditional routing, and quality control.
 """
 
+import os
+import asyncio
+import threading
 from langgraph.graph import StateGraph, END, START
 from ..agents import *
+from ..agents.base_agent import build_shared_context
 from ..utils.state import State
 from ..utils.monitoring import WorkflowMonitor, QualityChecker
 
@@ -78,13 +82,64 @@ def smart_revision_router(state, monitor: WorkflowMonitor):
     return "complete"
 
 
-def create_workflow(llm, openai_client):
+# One long-lived event loop for async agent calls. The workflow itself runs synchronously
+# (in the API's thread pool), and the LLM's async HTTP pool must stay on a single loop.
+_agent_loop = None
+_agent_loop_lock = threading.Lock()
+
+
+def run_agent_coroutine(coro):
+    """Run a coroutine on the shared agent event loop and wait for its result"""
+    global _agent_loop
+    with _agent_loop_lock:
+        if _agent_loop is None:
+            _agent_loop = asyncio.new_event_loop()
+            threading.Thread(target=_agent_loop.run_forever, name="agent-event-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _agent_loop).result()
+
+
+def create_parallel_node(*agents):
+    """
+    Create a workflow node that runs independent agents concurrently.
+    
+    Each agent only reads artifacts produced earlier in the workflow, and their LLM calls are
+    network-bound, so awaiting them together brings the node's latency down to the slowest agent.
+    
+    Args:
+        *agents: Agents whose run() methods don't depend on each other's output
+        
+    Returns:
+        callable: Node function returning the merged state update of all agents
+    """
+    async def gather_agents(state):
+        return await asyncio.gather(*(agent.arun(state) for agent in agents))
+    
+    def run_parallel(state):
+        # Build the campaign context every agent reads once, and send it as the same block to all of them
+        agent_state = {**state, "shared_context": build_shared_context(state)}
+        results = run_agent_coroutine(gather_agents(agent_state))
+        
+        # Merge the agents' updates: every new artifact and every response message
+        artifacts = {}
+        messages = []
+        for result in results:
+            artifacts.update(result["artifacts"])
+            messages.extend(result["messages"])
+        
+        return {**results[0], "messages": messages, "artifacts": artifacts}
+    
+    return run_parallel
+
+
+def create_workflow(llm, openai_client, fuse_content: bool = None):
     """
     Create the main campaign generation workflow with all agents and routing logic.
     
     Args:
         llm: ChatOpenAI instance for LLM interactions
         openai_client: OpenAI client for DALL-E image generation
+        fuse_content: Generate strategy, concepts, copy and image prompt in one LLM call
+            (defaults to the FUSED_CONTENT_AGENT environment variable)
         
     Returns:
         tuple: (StateGraph workflow, WorkflowMonitor instance)
@@ -109,6 +164,9 @@ def create_workflow(llm, openai_client):
     pdf_generator = PDFGeneratorTeam(llm)
     html_validation = HTMLValidationAgent(llm)
     
+    if fuse_content is None:
+        fuse_content = os.getenv("FUSED_CONTENT_AGENT", "false").lower() in ("1", "true", "yes")
+    
     # Create workflow graph
     workflow = StateGraph(State)
     
@@ -122,91 +180,44 @@ def create_workflow(llm, openai_client):
     workflow.add_node("cta_optimizer", cta_optimizer.run)
     workflow.add_node("visual", visual.run)
     workflow.add_node("designer", designer.run)
-    workflow.add_node("social_media_campaign", social_media_campaign.run)
-    workflow.add_node("emotion_personalization", emotion_personalization.run)
-    workflow.add_node("media_planner", media_planner.run)
+    workflow.add_node(
+        "specialized_agents",
+        create_parallel_node(social_media_campaign, emotion_personalization, media_planner)
+    )
     workflow.add_node("review", review.run)
     workflow.add_node("campaign_summary", campaign_summary.run)
     workflow.add_node("client_summary", client_summary.run)
     workflow.add_node("web_developer", web_developer.run)
     workflow.add_node("html_validation", html_validation.run)
+    if fuse_content:
+        workflow.add_node("fused_content", FusedContentAgent(llm).run)
     # workflow.add_node("pdf_generator", pdf_generator.run)  # Commented out as per user's edit
     
-    # Sequential workflow path
-    workflow.add_edge("project_manager", "strategy")
-    workflow.add_edge("strategy", "audience_persona")
-    workflow.add_edge("audience_persona", "creative")
-    workflow.add_edge("creative", "copy")
-    workflow.add_edge("copy", "cta_optimizer")
-    workflow.add_edge("cta_optimizer", "visual")
-    workflow.add_edge("visual", "designer")
-    
-    # Parallel execution simulation after designer
-    def route_after_designer(state):
-        """Route to parallel tasks after designer completion"""
-        # First, run social media campaign
-        if "social_media_campaign" not in state.get("artifacts", {}):
-            return "social_media_campaign"
-        # Then, run emotion personalization
-        elif "emotion_personalization" not in state.get("artifacts", {}):
-            return "emotion_personalization"
-        # Both complete, proceed to media planner
-        elif "media_plan" not in state.get("artifacts", {}):
-            return "media_planner"
-        # All parallel tasks complete, proceed to review
-        else:
-            return "review"
-    
-    workflow.add_conditional_edges(
-        "designer",
-        route_after_designer,
-        {
-            "social_media_campaign": "social_media_campaign",
-            "emotion_personalization": "emotion_personalization",
-            "media_planner": "media_planner",
-            "review": "review"
-        }
-    )
-    
-    # Route from social media campaign
-    def route_from_social_media(state):
-        """Route from social media campaign to remaining parallel tasks"""
-        if "emotion_personalization" not in state.get("artifacts", {}):
-            return "emotion_personalization"
-        elif "media_plan" not in state.get("artifacts", {}):
-            return "media_planner"
-        else:
-            return "review"
-    
-    workflow.add_conditional_edges(
-        "social_media_campaign",
-        route_from_social_media,
-        {
-            "emotion_personalization": "emotion_personalization",
-            "media_planner": "media_planner",
-            "review": "review"
-        }
-    )
-    
-    # Route from emotion personalization
-    def route_from_emotion(state):
-        """Route from emotion personalization to remaining parallel tasks"""
-        if "media_plan" not in state.get("artifacts", {}):
-            return "media_planner"
-        else:
-            return "review"
-    
-    workflow.add_conditional_edges(
-        "emotion_personalization",
-        route_from_emotion,
-        {
-            "media_planner": "media_planner",
-            "review": "review"
-        }
-    )
-    
-    # Route from media planner to review
-    workflow.add_edge("media_planner", "review")
+    if fuse_content:
+        # One LLM call produces strategy, concepts, copy and image prompt; the individual
+        # content teams are only reached through revision routing
+        workflow.add_edge("project_manager", "fused_content")
+        workflow.add_edge("fused_content", "audience_persona")
+        workflow.add_edge("audience_persona", "cta_optimizer")
+        workflow.add_edge("cta_optimizer", "designer")
+        workflow.add_edge("strategy", "creative")
+        workflow.add_edge("creative", "copy")
+        workflow.add_edge("copy", "visual")
+        workflow.add_edge("visual", "designer")
+    else:
+        # Sequential workflow path
+        workflow.add_edge("project_manager", "strategy")
+        workflow.add_edge("strategy", "audience_persona")
+        workflow.add_edge("audience_persona", "creative")
+        workflow.add_edge("creative", "copy")
+        workflow.add_edge("copy", "cta_optimizer")
+        workflow.add_edge("cta_optimizer", "visual")
+        workflow.add_edge("visual", "designer")
+    
+    # Social media, emotion personalization and media planning only depend on earlier
+    # artifacts, so they run concurrently in a single node after the designer
+    workflow.add_edge("designer", "specialized_agents")
+    workflow.add_edge("specialized_agents", "review")
     
     # Final sequential stages
     workflow.add_edge("review", "campaign_summary")
@@ -0,0 +1,135 @@
+import os
+import re
+import sys
+import zlib
+from datetime import datetime
+from decimal import Decimal
+
+import orjson
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "backend"))
+
+from boto3.dynamodb.types import Binary
+
+from src.utils import dynamodb_service
+from src.utils.dynamodb_service import DynamoDBService, _decode_payload, _encode_payload
+
+
+class RecordingTable:
+    """In-memory stand-in for a DynamoDB Table that applies SET update expressions"""
+
+    def __init__(self, items=None):
+        self.items = {item["campaign_id"]: item for item in items or []}
+        self.update_calls = []
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ExpressionAttributeNames, **kwargs):
+        self.update_calls.append({
+            "UpdateExpression": UpdateExpression,
+            "ExpressionAttributeValues": ExpressionAttributeValues,
+            "ExpressionAttributeNames": ExpressionAttributeNames,
+        })
+        item = self.items.setdefault(Key["campaign_id"], dict(Key))
+        for name, value in re.findall(r"(#\w+) = (:\w+)", UpdateExpression):
+            item[ExpressionAttributeNames[name]] = ExpressionAttributeValues[value]
+        return {}
+
+
+def make_service(table=None) -> DynamoDBService:
+    # Skip __init__, which connects to AWS; the item conversions only need the table
+    service = DynamoDBService.__new__(DynamoDBService)
+    service.table = table or RecordingTable()
+    return service
+
+
+def test_item_round_trip() -> None:
+    service = make_service()
+    campaign = {
+        "campaign_id": "c1",
+        "user_id": "alice",
+        "status": "completed",
+        "created_at": datetime(2024, 1, 2, 3, 4, 5),
+        "execution_time": 12.5,
+        "artifacts": {"strategy": "Go big", 1: "numbered", "score": 0.25},
+    }
+
+    item = service._to_item(campaign)
+
+    assert item["execution_time"] == Decimal("12.5")
+    assert item["created_at"] == "2024-01-02T03:04:05"
+    assert isinstance(item["payload"], Binary)
+    assert "artifacts" not in item
+
+    restored = service._from_item(item)
+    assert restored["execution_time"] == 12.5
+    assert isinstance(restored["execution_time"], float)
+    assert restored["created_at"] == "2024-01-02T03:04:05"
+    assert restored["artifacts"] == {"strategy": "Go big", "1": "numbered", "score": 0.25}
+
+
+def test_top_level_attributes_override_payload_after_update() -> None:
+    service = make_service()
+    item = service._to_item({"campaign_id": "c1", "campaign_name": "Old name", "user_id": "alice"})
+    service.table = RecordingTable([item])
+
+    assert service.update_campaign("c1", {"campaign_name": "New name"})
+
+    restored = service._from_item(service.table.items["c1"])
+    assert restored["campaign_name"] == "New name"
+    assert restored["user_id"] == "alice"
+    assert "updated_at" in restored
+
+
+def test_legacy_item_without_payload() -> None:
+    service = make_service()
+    legacy = {
+        "campaign_id": "c1",
+        "status": "completed",
+        "execution_time": Decimal("40"),
+        "quality_score": Decimal("0.5"),
+        "artifacts": {"copy": "Buy now"},
+    }
+
+    assert service._from_item(legacy) == {
+        "campaign_id": "c1",
+        "status": "completed",
+        "execution_time": 40,
+        "quality_score": 0.5,
+        "artifacts": {"copy": "Buy now"},
+    }
+
+
+def test_zlib_payload_still_decodes() -> None:
+    document = {"campaign_id": "c1", "artifacts": {"copy": "Buy now"}}
+    payload = Binary(zlib.compress(orjson.dumps(document)))
+
+    assert _decode_payload(payload) == document
+    assert _decode_payload(payload.value) == document
+
+
+def test_payload_round_trip_with_either_codec(monkeypatch) -> None:
+    document = {"campaign_id": "c1", "artifacts": {"copy": "Buy now " * 50}}
+
+    assert _decode_payload(_encode_payload(document)) == document
+
+    monkeypatch.setattr(dynamodb_service, "zstandard", None)
+    assert _decode_payload(_encode_payload(document)) == document
+
+
+def test_update_placeholders_do_not_collide() -> None:
+    service = make_service()
+
+    assert service.update_campaign("c1", {"foo_bar": 1, "foobar": 2})
+
+    call = service.table.update_calls[0]
+    names = call["ExpressionAttributeNames"]
+    assert sorted(names.values()) == ["foo_bar", "foobar", "updated_at"]
+    assert service.table.items["c1"]["foo_bar"] == 1
+    assert service.table.items["c1"]["foobar"] == 2
+
+
+def test_update_skips_the_key_attribute() -> None:
+    service = make_service()
+
+    assert service.update_campaign("c1", {"campaign_id": "other", "campaign_name": "Name"})
+
+    assert "campaign_id" not in service.table.update_calls[0]["ExpressionAttributeNames"].values()
@@ -0,0 +1,67 @@
+import os
+import sys
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "backend"))
+
+from src.utils.dynamodb_service import _stats_contribution, _stats_deltas
+
+
+def test_stats_contribution_missing_item() -> None:
+    assert _stats_contribution(None) == {}
+    assert _stats_contribution({}) == {}
+
+
+def test_stats_contribution_counts_status() -> None:
+    assert _stats_contribution({"campaign_id": "a", "status": "running"}) == {
+        "total_campaigns": Decimal(1),
+        "status_running": Decimal(1),
+    }
+
+
+def test_stats_contribution_unknown_status() -> None:
+    assert _stats_contribution({"campaign_id": "a"}) == {
+        "total_campaigns": Decimal(1),
+        "status_unknown": Decimal(1),
+    }
+
+
+def test_stats_contribution_completed_execution_time() -> None:
+    assert _stats_contribution({"status": "completed", "execution_time": 12.5}) == {
+        "total_campaigns": Decimal(1),
+        "status_completed": Decimal(1),
+        "completed_execution_time": Decimal("12.5"),
+    }
+
+
+def test_stats_contribution_ignores_execution_time_until_completed() -> None:
+    assert "completed_execution_time" not in _stats_contribution({"status": "failed", "execution_time": 3})
+
+
+def test_stats_deltas_new_campaign() -> None:
+    assert _stats_deltas(None, {"status": "running"}) == {
+        "total_campaigns": Decimal(1),
+        "status_running": Decimal(1),
+    }
+
+
+def test_stats_deltas_status_change() -> None:
+    old_item = {"status": "running"}
+    new_item = {"status": "completed", "execution_time": Decimal("40")}
+    assert _stats_deltas(old_item, new_item) == {
+        "status_running": Decimal(-1),
+        "status_completed": Decimal(1),
+        "completed_execution_time": Decimal(40),
+    }
+
+
+def test_stats_deltas_unchanged_item() -> None:
+    item = {"status": "completed", "execution_time": Decimal("40")}
+    assert _stats_deltas(item, dict(item)) == {}
+
+
+def test_stats_deltas_delete() -> None:
+    assert _stats_deltas({"status": "failed"}, None) == {
+        "total_campaigns": Decimal(-1),
+        "status_failed": Decimal(-1),
+    }